@@ -0,0 +1,103 @@
+"""Run the benchmark suite and compare it against a JSON baseline.
+
+    python -m benchmarks --save baseline.json
+    python -m benchmarks --compare baseline.json --threshold 0.25
+
+Every result is the best observed wall time of one call, in seconds,
+except for the memory suite, which reports bytes per node.
+With ``--compare`` the process exits with status 1 when any benchmark is
+slower than its baseline by more than the threshold.
+"""
+
+from typing import Dict
+
+import argparse
+import importlib
+import json
+import platform
+import sys
+
+SUITES = (
+    "dispatch",
+    "graphs",
+    "transformation",
+    "detection",
+    "runner",
+    "imports",
+    "memory",
+)
+
+
+def collect(suites) -> Dict[str, float]:
+    results = {}
+    for suite in suites:
+        module = importlib.import_module(f"benchmarks.{suite}")
+        results.update(module.run())
+    return results
+
+
+def compare(
+    results: Dict[str, float], baseline: Dict[str, float], threshold: float
+) -> int:
+    regressions = 0
+    for name, value in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"{name:<56}{value:12.3e}  (new)")
+            continue
+
+        ratio = value / reference if reference > 0 else float("inf")
+        regressed = ratio > 1 + threshold
+        regressions += regressed
+        print(
+            f"{name:<56}{value:12.3e}{reference:12.3e}{ratio:8.2f}x"
+            + ("  REGRESSION" if regressed else "")
+        )
+
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--suite", action="append", choices=SUITES)
+    parser.add_argument("--save", help="write the results to a JSON baseline")
+    parser.add_argument("--compare", help="compare against a JSON baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed slowdown before a benchmark counts as a regression",
+    )
+    args = parser.parse_args()
+
+    results = collect(args.suite or SUITES)
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "results": results,
+                },
+                file,
+                indent=2,
+                sort_keys=True,
+            )
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+
+        regressions = compare(results, baseline, args.threshold)
+        print(f"{regressions} regression(s) above {args.threshold:.0%}")
+        return 1 if regressions else 0
+
+    for name, value in results.items():
+        print(f"{name:<56}{value:12.3e}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
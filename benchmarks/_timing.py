@@ -0,0 +1,8 @@
+from typing import Callable
+
+import timeit
+
+
+def per_call(func: Callable, number: int = 1000, repeat: int = 5) -> float:
+    """Best-of-``repeat`` wall time of a single ``func()`` call, in seconds."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
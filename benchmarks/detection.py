@@ -0,0 +1,72 @@
+"""Template detection throughput on synthetic frames.
+
+Frames are smoothed noise so that a cropped template matches exactly
+once. Each resolution is measured with several template sizes, at full
+resolution and in two-level pyramid mode. The shared cases run several
+grayscale pyramid detectors over one capture, passed either as a bare
+array or as a Frame that converts it only once.
+"""
+
+from typing import Dict
+
+from benchmarks._timing import per_call
+
+RESOLUTIONS = {"720p": (720, 1280), "1080p": (1080, 1920), "4k": (2160, 3840)}
+TEMPLATE_SIZES = (32, 64, 128)
+SHARED_DETECTORS = 4
+
+
+def synthetic_frame(height: int, width: int, seed: int = 0):
+    import cv2
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    return cv2.GaussianBlur(frame, (7, 7), 0)
+
+
+def run(number: int = 1, repeat: int = 3) -> Dict[str, float]:
+    try:
+        from gurun.cv.detection import TemplateDetection
+        from gurun.cv.frame import Frame
+    except ImportError:
+        return {}
+
+    results = {}
+    for resolution, (height, width) in RESOLUTIONS.items():
+        frame = synthetic_frame(height, width)
+        for size in TEMPLATE_SIZES:
+            y, x = height // 2, width // 3
+            template = frame[y : y + size, x : x + size].copy()
+
+            for levels in (0, 2):
+                node = TemplateDetection(template, pyramid_levels=levels)
+                label = f"detection.{resolution}_template_{size}_pyramid_{levels}"
+                results[label] = per_call(lambda: node.run(frame), number, repeat)
+
+        y, x = height // 2, width // 3
+        nodes = [
+            TemplateDetection(
+                frame[y : y + 64, x + 64 * i : x + 64 * (i + 1)].copy(),
+                pyramid_levels=2,
+                grayscale=True,
+            )
+            for i in range(SHARED_DETECTORS)
+        ]
+
+        def shared(image):
+            for node in nodes:
+                node.run(image)
+
+        label = f"detection.{resolution}_shared_{SHARED_DETECTORS}"
+        results[f"{label}_array"] = per_call(lambda: shared(frame), number, repeat)
+        results[f"{label}_frame"] = per_call(
+            lambda: shared(Frame(frame)), number, repeat
+        )
+
+    return results
+
+
+if __name__ == "__main__":
+    for label, value in run().items():
+        print(f"{label:<48}{value * 1e3:10.2f} ms/call")
@@ -0,0 +1,59 @@
+"""Per-call overhead of ``Node.run`` dispatch.
+
+Compares the current class-level ``run`` wrapper against the previous
+``__getattribute__`` based dispatch, which built a new closure on every
+attribute lookup. Run with ``python -m benchmarks.dispatch``.
+"""
+
+from typing import Any, Dict
+
+from benchmarks._timing import per_call
+from gurun.node import ConstantNode, _BaseNode
+
+
+class LegacyNode(_BaseNode):
+    def __getattribute__(self, attr):
+        attribute = super().__getattribute__(attr)
+
+        if attr == "run":
+            return self._run(attribute)
+
+        return attribute
+
+    def run(self, *args: Any, **kwargs: Any) -> Any:
+        raise NotImplementedError
+
+
+class LegacyConstantNode(LegacyNode):
+    def __init__(self, default_output: Any, **kwargs: Any) -> None:
+        super().__init__(default_output=default_output, **kwargs)
+
+    def run(self, *args: Any, **kwargs: Any) -> Any:
+        return self.output
+
+
+class RawConstantNode(object):
+    def __init__(self, default_output: Any) -> None:
+        self.output = default_output
+
+    def run(self, *args: Any, **kwargs: Any) -> Any:
+        return self.output
+
+
+def run(number: int = 200_000, repeat: int = 5) -> Dict[str, float]:
+    raw = RawConstantNode(1)
+    legacy = LegacyConstantNode(1)
+    current = ConstantNode(1)
+
+    return {
+        "dispatch.plain_method_call": per_call(lambda: raw.run(), number, repeat),
+        "dispatch.legacy_getattribute": per_call(
+            lambda: legacy.run(), number // 10, repeat
+        ),
+        "dispatch.node_run": per_call(lambda: current.run(), number, repeat),
+    }
+
+
+if __name__ == "__main__":
+    for label, value in run().items():
+        print(f"{label:<36}{value * 1e9:8.1f} ns/call")
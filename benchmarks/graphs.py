@@ -0,0 +1,68 @@
+"""Cost of interpreting ``NodeSequence`` and ``UnionNode`` graphs.
+
+Sequences are measured by depth (nested sequences) and width (children of
+one sequence), unions by width, each interpreted and compiled with
+``gurun.compile``. The stream cases report the cost per item of running
+a sequence over an iterable, with ``run`` in a loop and with ``stream``.
+"""
+
+from typing import Dict
+
+from benchmarks._timing import per_call
+from gurun.compiler import compile
+from gurun.node import ConstantNode, Node, NodeSequence, UnionNode
+
+SIZES = (1, 10, 100)
+STREAM_ITEMS = 1000
+
+
+class Increment(Node):
+    def run(self, x: int = 0) -> int:
+        return x + 1
+
+
+def _deep_sequence(depth: int) -> Node:
+    node = Increment()
+    for _ in range(depth - 1):
+        node = NodeSequence([node])
+    return node
+
+
+def run(number: int = 2000, repeat: int = 5) -> Dict[str, float]:
+    results = {}
+    for size in SIZES:
+        graphs = {
+            f"sequence_depth_{size}": _deep_sequence(size),
+            f"sequence_width_{size}": NodeSequence(
+                [ConstantNode(0)] + [Increment() for _ in range(size)]
+            ),
+            f"union_width_{size}": UnionNode(
+                [Increment(name=str(index)) for index in range(size)]
+            ),
+        }
+
+        for label, graph in graphs.items():
+            compiled = compile(graph)
+            results[f"graphs.{label}"] = per_call(lambda: graph.run(0), number, repeat)
+            results[f"graphs.{label}_compiled"] = per_call(
+                lambda: compiled.run(0), number, repeat
+            )
+
+    sequence = NodeSequence([Increment() for _ in range(10)])
+    items = range(STREAM_ITEMS)
+    streams = {
+        "stream_loop": lambda: [sequence.run(item) for item in items],
+        "stream": lambda: list(sequence.stream(items)),
+        "stream_parallel": lambda: list(sequence.stream(items, parallel=True)),
+    }
+    for label, func in streams.items():
+        results[f"graphs.{label}_{STREAM_ITEMS}"] = (
+            per_call(func, number // 1000 or 1, repeat) / STREAM_ITEMS
+        )
+
+    return results
+
+
+if __name__ == "__main__":
+    for label, value in run().items():
+        print(f"{label:<44}{value * 1e6:10.2f} us/call")
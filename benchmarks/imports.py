@@ -0,0 +1,51 @@
+"""Cold import time of the package and its subpackages.
+
+Each module is imported in a fresh interpreter, and the start-up time of
+an empty interpreter is subtracted, so the results track what importing
+gurun adds to short-lived scripts.
+"""
+
+from typing import Dict
+
+import subprocess
+import sys
+import time
+
+MODULES = (
+    "gurun",
+    "gurun.runner",
+    "gurun.utils",
+    "gurun.cv",
+    "gurun.gui",
+    "gurun.cv.detection",
+)
+
+
+def _interpreter(statement: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def run(repeat: int = 5) -> Dict[str, float]:
+    baseline = _interpreter("pass", repeat)
+
+    results = {}
+    for module in MODULES:
+        try:
+            elapsed = _interpreter(f"import {module}", repeat)
+        except subprocess.CalledProcessError:
+            continue
+
+        results[f"imports.{module}"] = max(elapsed - baseline, 0.0)
+
+    return results
+
+
+if __name__ == "__main__":
+    for label, value in run().items():
+        print(f"{label:<48}{value * 1e3:10.2f} ms")
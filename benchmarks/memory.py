@@ -0,0 +1,59 @@
+"""Memory footprint of the core node types.
+
+Each type is instantiated many times under tracemalloc and the traced
+growth is divided by the instance count. Unlike the other suites the
+results are bytes per node, not seconds.
+"""
+
+from typing import Dict
+
+import gc
+import tracemalloc
+
+COUNT = 10_000
+
+
+def _per_instance(factory, count: int = COUNT) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        instances = [factory() for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    # The list holding the instances is not part of their footprint
+    return (after - before - instances.__sizeof__()) / count
+
+
+def run() -> Dict[str, float]:
+    from gurun.node import (
+        BranchNode,
+        ConstantNode,
+        Node,
+        NodeSequence,
+        NullNode,
+        UnionNode,
+        WrapperNode,
+    )
+
+    leaf = NullNode()
+    factories = {
+        "Node": Node,
+        "ConstantNode": lambda: ConstantNode(1),
+        "WrapperNode": lambda: WrapperNode(len),
+        "NodeSequence": lambda: NodeSequence([leaf, leaf]),
+        "UnionNode": lambda: UnionNode([leaf, leaf]),
+        "BranchNode": lambda: BranchNode(leaf, positive=leaf, negative=leaf),
+    }
+
+    return {
+        f"memory.{label}_bytes": _per_instance(factory)
+        for label, factory in factories.items()
+    }
+
+
+if __name__ == "__main__":
+    for label, value in run().items():
+        print(f"{label:<48}{value:10.1f} bytes/node")
@@ -0,0 +1,57 @@
+"""Loop overhead of ``Runner`` and ``ScheduledRunner`` with trivial nodes."""
+
+from typing import Any, Dict
+
+import contextlib
+import io
+import time
+
+from gurun.node import Node
+from gurun.runner import Runner, ScheduledRunner
+
+NODES = 10
+PASSES = 2000
+
+
+class StopAfter(Node):
+    def __init__(self, calls: int, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._calls = calls
+        self._count = 0
+
+    def run(self, *args: Any, **kwargs: Any) -> None:
+        self._count += 1
+        if self._count >= self._calls:
+            raise KeyboardInterrupt()
+
+
+class Noop(Node):
+    def run(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+def _time_loop(runner: Runner, iterations: int) -> float:
+    start = time.perf_counter()
+    # Runners report the interruption that ends the measurement
+    with contextlib.redirect_stdout(io.StringIO()):
+        runner.run()
+    return (time.perf_counter() - start) / iterations
+
+
+def run(repeat: int = 3) -> Dict[str, float]:
+    results = {"runner.pass": [], "runner.scheduled_run": []}
+    for _ in range(repeat):
+        nodes = [Noop() for _ in range(NODES)] + [StopAfter(PASSES)]
+        results["runner.pass"].append(_time_loop(Runner(nodes, interval=0), PASSES))
+
+        nodes = [(Noop(), 0) for _ in range(NODES)] + [(StopAfter(PASSES), 0)]
+        results["runner.scheduled_run"].append(
+            _time_loop(ScheduledRunner(nodes), PASSES * (NODES + 1))
+        )
+
+    return {label: min(values) for label, values in results.items()}
+
+
+if __name__ == "__main__":
+    for label, value in run().items():
+        print(f"{label:<36}{value * 1e6:10.2f} us/call")
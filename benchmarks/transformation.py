@@ -0,0 +1,44 @@
+"""Detection transformations over large rectangle arrays."""
+
+from typing import Dict
+
+from benchmarks._timing import per_call
+
+SIZES = (1, 1000, 100_000)
+
+
+def run(number: int = 3, repeat: int = 3) -> Dict[str, float]:
+    try:
+        import numpy as np
+
+        from gurun.cv.transformation import (
+            NaturalRectToPoint,
+            Offset,
+            RectToPoint,
+            TransformationChain,
+        )
+    except ImportError:
+        return {}
+
+    rng = np.random.default_rng(0)
+    nodes = {
+        "rect_to_point": RectToPoint(),
+        "natural_rect_to_point": NaturalRectToPoint(),
+        "offset": Offset(10, 20),
+        "chain": TransformationChain([RectToPoint(), Offset(10, 20)]),
+    }
+
+    results = {}
+    for size in SIZES:
+        rectangles = rng.integers(0, 2000, (size, 4)).astype(np.int32)
+        for label, node in nodes.items():
+            results[f"transformation.{label}_{size}"] = per_call(
+                lambda: node.run(rectangles.copy()), number, repeat
+            )
+
+    return results
+
+
+if __name__ == "__main__":
+    for label, value in run().items():
+        print(f"{label:<48}{value * 1e6:12.2f} us/call")
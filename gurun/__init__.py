@@ -1,23 +1,24 @@
 """Framework de autotomação de tarefas"""
 
-import sys
+from typing import Any, List
 
-if sys.version_info >= (3, 8):
-    from importlib import metadata as importlib_metadata
-else:
-    import importlib_metadata  # pragma: no cover
+import importlib
 
 
 def get_version() -> str:
+    import sys
+
+    if sys.version_info >= (3, 8):
+        from importlib import metadata as importlib_metadata
+    else:
+        import importlib_metadata  # pragma: no cover
+
     try:
         return importlib_metadata.version(__name__)
     except importlib_metadata.PackageNotFoundError:  # pragma: no cover
         return "unknown"
 
 
-version: str = get_version()
-
-from gurun import exceptions, runner, utils
 from gurun.node import (
     BranchNode,
     ConstantNode,
@@ -29,6 +30,41 @@ from gurun.node import (
     WrapperNode,
 )
 
+# Submodules and attributes resolved on first access, so `import gurun`
+# stays cheap for short-lived scripts that never touch them.
+_LAZY = {
+    "exceptions": ("gurun.exceptions", None),
+    "runner": ("gurun.runner", None),
+    "utils": ("gurun.utils", None),
+    "context": ("gurun.context", None),
+    "metrics": ("gurun.metrics", None),
+    "tracing": ("gurun.tracing", None),
+    "cv": ("gurun.cv", None),
+    "gui": ("gurun.gui", None),
+    "CompiledNode": ("gurun.compiler", "CompiledNode"),
+    "compile": ("gurun.compiler", "compile"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name == "version":
+        value = get_version()
+    elif name in _LAZY:
+        module_name, attribute = _LAZY[name]
+        value = importlib.import_module(module_name)
+        if attribute is not None:
+            value = getattr(value, attribute)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY) | {"version"})
+
+
 __all__ = [
     "version",
     "Node",
@@ -39,6 +75,7 @@ __all__ = [
     "NodeSequence",
     "UnionNode",
     "BranchNode",
+    "CompiledNode",
     "exceptions",
     "runner",
     "utils",
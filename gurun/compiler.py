@@ -0,0 +1,184 @@
+from typing import Any, Callable
+
+import gurun.node
+from gurun.node import BranchNode, Node, NodeSequence, NodeSet, UnionNode
+
+
+def _bind(node: Node, plan: Callable) -> Callable:
+    args_memory = node._args_memory
+    memory = node._memory
+
+    if args_memory or memory:
+
+        def run(*args: Any, **kwargs: Any) -> Any:
+            output = plan(*args_memory, *args, **memory, **kwargs)
+            node._BaseNode__output = output
+            return output
+
+    else:
+
+        def run(*args: Any, **kwargs: Any) -> Any:
+            output = plan(*args, **kwargs)
+            node._BaseNode__output = output
+            return output
+
+    return run
+
+
+def _compile_node_set(node: NodeSet) -> Callable:
+    steps = [_compile(child) for child in node.nodes]
+
+    def plan(*args: Any, **kwargs: Any) -> None:
+        for step in steps:
+            step()
+
+    return plan
+
+
+def _compile_node_sequence(node: NodeSequence) -> Callable:
+    if len(node.nodes) == 0:
+        return lambda *args, **kwargs: None
+
+    ignore_none_output = node.ignore_none_output
+    first = node.nodes[0]
+    first_step = _compile(first)
+    # Each step knows at compile time whether the previous node ravels.
+    steps = [
+        (_compile(child), child, previous.ravel)
+        for previous, child in zip(node.nodes, node.nodes[1:])
+    ]
+
+    def plan(*args: Any, **kwargs: Any) -> Any:
+        output = first_step(*args, **kwargs)
+        state = first.state
+        if state:
+            for step, child, ravel in steps:
+                if output is None and ignore_none_output:
+                    output = step()
+                elif ravel:
+                    output = step(**output)
+                else:
+                    output = step(output)
+
+                state = child.state
+                if not state:
+                    break
+
+        node.state = state
+        return output
+
+    return plan
+
+
+def _compile_union_node(node: UnionNode) -> Callable:
+    ignore_none_output = node.ignore_none_output
+    steps = [(_compile(child), child, child.name) for child in node.nodes]
+    return_node_names = node.return_node_names
+
+    def plan(*args: Any, **kwargs: Any) -> Any:
+        output = {}
+        for step, child, name in steps:
+            result = step(*args, **kwargs)
+
+            if not (result is None and ignore_none_output):
+                output[name] = result
+
+            if not child.state:
+                node.state = False
+                return None
+
+        node.state = True
+        if return_node_names is None:
+            return output
+        elif len(return_node_names) == 1:
+            return output.get(return_node_names[0])
+        return {index: output[index] for index in return_node_names}
+
+    return plan
+
+
+def _compile_branch_node(node: BranchNode) -> Callable:
+    ignore_none_output = node.ignore_none_output
+    trigger = node.trigger
+    trigger_step = _compile(trigger)
+    ravel = trigger.ravel
+    branches = {
+        True: (_compile(node.positive), node.positive),
+        False: (_compile(node.negative), node.negative),
+    }
+
+    def plan(*args: Any, **kwargs: Any) -> Any:
+        trigger_result = trigger_step(*args, **kwargs)
+        step, branch = branches[trigger.state]
+
+        if trigger_result is None and ignore_none_output:
+            output = step()
+        elif ravel:
+            output = step(**trigger_result)
+        else:
+            output = step(trigger_result)
+
+        node.state = branch.state
+        return output
+
+    return plan
+
+
+_COMPILERS = {
+    NodeSet.run: _compile_node_set,
+    NodeSequence.run: _compile_node_sequence,
+    UnionNode.run: _compile_union_node,
+    BranchNode.run: _compile_branch_node,
+}
+
+
+def _compile(node: Node) -> Callable:
+    # Subclasses that override run, verbose nodes and parallel unions are
+    # left to the interpreter and called as opaque steps.
+    compiler = _COMPILERS.get(type(node).run)
+    if compiler is None or node.verbose or getattr(node, "parallel", False):
+        return node.run
+
+    return _bind(node, compiler(node))
+
+
+class CompiledNode(Node):
+    def __init__(self, node: Node, **kwargs: Any) -> None:
+        kwargs.setdefault("name", node.name)
+        kwargs.setdefault("ravel", node.ravel)
+        super().__init__(**kwargs)
+        self._node = node
+        self._plan = _compile(node)
+
+    @property
+    def node(self) -> Node:
+        return self._node
+
+    def _interpret(self, *args: Any, **kwargs: Any) -> Any:
+        # This node already reports the root to the hooks under its name,
+        # so the root's raw run is called and only its children go through
+        # their observed wrappers.
+        node = self._node
+        output = type(node).run._gurun_run(
+            node, *node._args_memory, *args, **node._memory, **kwargs
+        )
+        node._BaseNode__output = output
+        return output
+
+    def run(self, *args: Any, **kwargs: Any) -> Any:
+        # The plan skips the wrappers of inner containers, so while metrics
+        # or tracing hooks are registered the graph is interpreted instead.
+        if gurun.node._hooks:
+            output = self._interpret(*args, **kwargs)
+        else:
+            output = self._plan(*args, **kwargs)
+
+        self.state = self._node.state
+        return output
+
+    def close(self) -> None:
+        self._node.close()
+
+
+def compile(node: Node) -> CompiledNode:
+    return CompiledNode(node)
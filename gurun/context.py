@@ -0,0 +1,34 @@
+from typing import Iterator, Optional
+
+import contextlib
+import itertools
+import time
+from contextvars import ContextVar
+
+
+class Tick(object):
+    __slots__ = ("index", "started")
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.started = time.monotonic()
+
+    def __repr__(self) -> str:
+        return f"Tick({self.index})"
+
+
+_counter = itertools.count(1)
+_current_tick: ContextVar = ContextVar("gurun_tick", default=None)
+
+
+def current_tick() -> Optional[Tick]:
+    return _current_tick.get()
+
+
+@contextlib.contextmanager
+def tick() -> Iterator[Tick]:
+    token = _current_tick.set(Tick(next(_counter)))
+    try:
+        yield _current_tick.get()
+    finally:
+        _current_tick.reset(token)
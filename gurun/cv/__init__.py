@@ -1,3 +1,39 @@
-from . import detection, transformation
+from typing import Any, List
 
-__all__ = ["detection", "transformation"]
+import importlib
+
+_SUBMODULES = (
+    "bus",
+    "detection",
+    "frame",
+    "memo",
+    "parallel",
+    "sources",
+    "store",
+    "transformation",
+)
+
+
+def __getattr__(name: str) -> Any:
+    # Backends such as cv2, mss and pyautogui are only imported when the
+    # submodule that needs them is first accessed.
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_SUBMODULES))
+
+
+__all__ = [
+    "bus",
+    "detection",
+    "frame",
+    "memo",
+    "parallel",
+    "sources",
+    "store",
+    "transformation",
+]
@@ -0,0 +1,80 @@
+from typing import Any, Tuple
+
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError(
+        "cv2 is not installed. Please install it with `pip install opencv-python`."
+    )
+
+from gurun.context import current_tick
+from gurun.node import Node
+
+
+class FrameBus(Node):
+    def __init__(self, source_node: Node, max_age: float = None, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._source_node = source_node
+        self._max_age = max_age
+        self._lock = threading.Lock()
+        self._frame = None
+        self._frame_state = False
+        self._tick = None
+        self._captured_at = None
+        self.captures = 0
+        self.reuses = 0
+
+    @property
+    def source_node(self) -> Node:
+        return self._source_node
+
+    @property
+    def origin(self) -> Tuple[int, int]:
+        return getattr(self._source_node, "origin", None)
+
+    def _fresh(self) -> bool:
+        if self._captured_at is None:
+            return False
+
+        tick = current_tick()
+        if tick is not None and tick is self._tick:
+            return True
+
+        return (
+            self._max_age is not None
+            and time.monotonic() - self._captured_at < self._max_age
+        )
+
+    def run(self, *args: Any, **kwargs: Any) -> np.ndarray:
+        # Detectors running in parallel block here until the first one has
+        # captured the frame, then all of them read the same one.
+        with self._lock:
+            if self._fresh():
+                self.reuses += 1
+            else:
+                frame = self._source_node.run(*args, **kwargs)
+                if isinstance(frame, np.ndarray):
+                    frame = frame.view()
+                    frame.setflags(write=False)
+
+                self._frame = frame
+                self._frame_state = self._source_node.state
+                self._tick = current_tick()
+                self._captured_at = time.monotonic()
+                self.captures += 1
+
+            self.state = self._frame_state
+            return self._frame
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._frame = None
+            self._tick = None
+            self._captured_at = None
+
+    def close(self) -> None:
+        self.invalidate()
+        self._source_node.close()
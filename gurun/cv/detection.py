@@ -1,4 +1,4 @@
-from typing import Any, List, Union
+from typing import Any, Dict, List, Tuple, Union
 
 try:
     import cv2
@@ -8,9 +8,140 @@ except ImportError:
         "cv2 is not installed. Please install it with `pip install opencv-python`."
     )
 
+from gurun.cv.frame import Frame
+from gurun.cv.memo import FrameMemo
+from gurun.cv.store import imread
 from gurun.node import Node
 
 
+def _pyramid_down(image: np.ndarray, levels: int) -> np.ndarray:
+    for _ in range(levels):
+        image = cv2.pyrDown(image)
+
+    return image
+
+
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 2:
+        return image
+
+    code = cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+    return cv2.cvtColor(image, code)
+
+
+def _crop(
+    image: Union[np.ndarray, Frame], region: Tuple[int, int, int, int]
+) -> Union[np.ndarray, Frame]:
+    if region is None:
+        return image
+
+    if isinstance(image, Frame):
+        return image.crop(region)
+
+    x, y, width, height = region
+    return image[y : y + height, x : x + width]
+
+
+def _check_size(height: int, width: int, target: np.ndarray, what: str) -> None:
+    if height < target.shape[0] or width < target.shape[1]:
+        raise ValueError(
+            f"{what} of {width}x{height} is smaller than the "
+            f"{target.shape[1]}x{target.shape[0]} template"
+        )
+
+
+def _check_region(region: Tuple[int, int, int, int], target: np.ndarray) -> None:
+    if region is not None:
+        _check_size(region[3], region[2], target, "Search region")
+
+
+def _views(
+    image: Union[np.ndarray, Frame], pyramid_levels: int, grayscale: bool
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Frames memoize their gray and pyramid views, so detectors sharing a
+    # frame only pay for each conversion once.
+    if isinstance(image, Frame):
+        full = image.gray() if grayscale else image.image
+        if pyramid_levels > 0:
+            return full, image.pyramid(pyramid_levels, grayscale)
+
+        return full, None
+
+    if grayscale:
+        image = _to_gray(image)
+
+    if pyramid_levels > 0:
+        return image, _pyramid_down(image, pyramid_levels)
+
+    return image, None
+
+
+_EMPTY_RECTANGLES = np.empty((0, 4), dtype=np.int32)
+
+
+def _local_maxima(
+    result: np.ndarray, threshold: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    mask = result >= threshold
+    if not mask.any():
+        return (np.empty(0, np.intp), np.empty(0, np.intp), np.empty(0, result.dtype))
+
+    # A 3x3 dilation keeps only the peaks of each above-threshold blob, so
+    # the candidate count follows the objects rather than the pixels.
+    mask &= result >= cv2.dilate(result, np.ones((3, 3), np.uint8))
+    yloc, xloc = np.nonzero(mask)
+    scores = result[yloc, xloc]
+
+    # Flat plateaus survive the dilation as a whole. Neighbouring peaks
+    # always share a score, so each connected group of peaks is one plateau
+    # and only its first pixel in scan order is kept.
+    _, labels = cv2.connectedComponents(mask.view(np.uint8), connectivity=8)
+    _, first = np.unique(labels[yloc, xloc], return_index=True)
+    keep = np.sort(first)
+
+    return xloc[keep], yloc[keep], scores[keep]
+
+
+def _non_max_suppression(
+    xloc: np.ndarray,
+    yloc: np.ndarray,
+    scores: np.ndarray,
+    width: int,
+    height: int,
+    overlap_threshold: float,
+) -> np.ndarray:
+    if len(scores) == 0:
+        return _EMPTY_RECTANGLES
+
+    order = np.argsort(-scores, kind="stable")
+    xloc = xloc[order]
+    yloc = yloc[order]
+    area = 2 * width * height
+
+    keep = []
+    remaining = np.arange(len(order))
+    while len(remaining) > 0:
+        best = remaining[0]
+        keep.append(best)
+
+        rest = remaining[1:]
+        # All boxes share the template size, so the overlap only depends on
+        # the distance between their corners.
+        inter = np.clip(width - np.abs(xloc[rest] - xloc[best]), 0, None) * np.clip(
+            height - np.abs(yloc[rest] - yloc[best]), 0, None
+        )
+        remaining = rest[inter <= overlap_threshold * (area - inter)]
+
+    keep = np.asarray(keep)
+    rectangles = np.empty((len(keep), 4), dtype=np.int32)
+    rectangles[:, 0] = xloc[keep]
+    rectangles[:, 1] = yloc[keep]
+    rectangles[:, 2] = width
+    rectangles[:, 3] = height
+
+    return rectangles
+
+
 class TemplateDetection(Node):
     def __init__(
         self,
@@ -18,15 +149,27 @@ class TemplateDetection(Node):
         threshold: float = 0.7,
         single_match: bool = False,
         method: int = cv2.TM_CCOEFF_NORMED,
+        region: Tuple[int, int, int, int] = None,
+        pyramid_levels: int = 0,
+        refine_margin: int = None,
+        coarse_threshold: float = None,
+        overlap_threshold: float = 0.3,
+        memoize: Union[bool, FrameMemo] = False,
+        grayscale: bool = False,
         **kwargs: Any,
     ) -> None:
         super().__init__(**kwargs)
         if isinstance(target, str):
-            target = cv2.imread(target)
+            flags = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR
+            path, target = target, imread(target, flags)
             if target is None:
                 raise ValueError(
-                    f"Template Detection target file {target} does not exist"
+                    f"Template Detection target file {path} does not exist"
                 )
+        elif grayscale:
+            target = _to_gray(target)
+
+        _check_region(region, target)
 
         self._target = target
         self._target_height = int(target.shape[0])
@@ -34,30 +177,124 @@ class TemplateDetection(Node):
         self._threshold = threshold
         self._single_match = single_match
         self._method = method
+        self._region = region
+        self._overlap_threshold = overlap_threshold
+        self._grayscale = grayscale
+        self._memo = FrameMemo() if memoize is True else (memoize or None)
+        if self._memo is not None:
+            self._memo.attach(self)
+
+        if pyramid_levels < 0:
+            raise ValueError("pyramid_levels must be a non-negative integer")
+
+        self._pyramid_levels = pyramid_levels
+        self._coarse_target = _pyramid_down(target, pyramid_levels)
+        self._refine_margin = (
+            2**pyramid_levels if refine_margin is None else refine_margin
+        )
+        self._coarse_threshold = (
+            threshold * 0.8 if coarse_threshold is None else coarse_threshold
+        )
+
+    def _suppress(
+        self, xloc: np.ndarray, yloc: np.ndarray, scores: np.ndarray
+    ) -> np.ndarray:
+        return _non_max_suppression(
+            xloc,
+            yloc,
+            scores,
+            self._target_width,
+            self._target_height,
+            self._overlap_threshold,
+        )
+
+    def _refine(self, image: np.ndarray, coarse_image: np.ndarray) -> np.ndarray:
+        result = cv2.matchTemplate(coarse_image, self._coarse_target, self._method)
+        coarse = _non_max_suppression(
+            *_local_maxima(result, self._coarse_threshold),
+            self._coarse_target.shape[1],
+            self._coarse_target.shape[0],
+            self._overlap_threshold,
+        )
+
+        scale = 2**self._pyramid_levels
+        margin = self._refine_margin
+        image_height, image_width = image.shape[:2]
+
+        xs, ys, scores = [], [], []
+        for coarse_x, coarse_y, _, _ in coarse:
+            x0 = max(int(coarse_x) * scale - margin, 0)
+            y0 = max(int(coarse_y) * scale - margin, 0)
+            x1 = min(int(coarse_x) * scale + self._target_width + margin, image_width)
+            y1 = min(int(coarse_y) * scale + self._target_height + margin, image_height)
+
+            if x1 - x0 < self._target_width or y1 - y0 < self._target_height:
+                continue
+
+            window = image[y0:y1, x0:x1]
+            result = cv2.matchTemplate(window, self._target, self._method)
+            window_xloc, window_yloc, window_scores = _local_maxima(
+                result, self._threshold
+            )
+            xs.append(window_xloc + x0)
+            ys.append(window_yloc + y0)
+            scores.append(window_scores)
+
+        if len(xs) == 0:
+            return _EMPTY_RECTANGLES
+
+        return self._suppress(
+            np.concatenate(xs), np.concatenate(ys), np.concatenate(scores)
+        )
+
+    def _detect(self, image: np.ndarray, coarse_image: np.ndarray = None) -> np.ndarray:
+        # Regions clipped by the frame border can still end up too small
+        _check_size(image.shape[0], image.shape[1], self._target, "Search area")
+
+        if self._pyramid_levels > 0:
+            if coarse_image is None:
+                coarse_image = _pyramid_down(image, self._pyramid_levels)
+
+            return self._refine(image, coarse_image)
+
+        result = cv2.matchTemplate(image, self._target, self._method)
+
+        return self._suppress(*_local_maxima(result, self._threshold))
+
+    @property
+    def memo(self) -> FrameMemo:
+        return self._memo
 
     def run(
-        self, image: Union[np.ndarray, str], *args: Any, **kwargs: Any
+        self, image: Union[np.ndarray, Frame, str], *args: Any, **kwargs: Any
     ) -> List[List[int]]:
         if isinstance(image, str):
-            image = cv2.imread(image)
+            image = imread(image)
             if image is None:
                 raise ValueError("Template Detection image file does not exist")
 
-        result = cv2.matchTemplate(image, self._target, self._method)
-
-        yloc, xloc = np.where(result >= self._threshold)
+        image, coarse_image = _views(
+            _crop(image, self._region), self._pyramid_levels, self._grayscale
+        )
 
-        rectangles = []
-        for (x, y) in zip(xloc, yloc):
-            rectangles.append([int(x), int(y), self._target_width, self._target_height])
-            rectangles.append([int(x), int(y), self._target_width, self._target_height])
+        if self._memo is None:
+            rectangles = self._detect(image, coarse_image)
+        else:
+            digest = self._memo.digest(image)
+            hit, rectangles = self._memo.get(digest)
+            if not hit:
+                rectangles = self._detect(image, coarse_image)
+                self._memo.put(digest, rectangles)
 
-        rectangles, _ = cv2.groupRectangles(rectangles, 1, 0.2)
+            rectangles = rectangles.copy()
 
         if len(rectangles) == 0:
             self.state = False
             return None
 
+        if self._region is not None:
+            rectangles = rectangles + [self._region[0], self._region[1], 0, 0]
+
         self.state = True
         return rectangles[0] if self._single_match else rectangles
 
@@ -66,12 +303,153 @@ class TemplateDetectionFrom(TemplateDetection):
     def __init__(
         self,
         source_node: Node,
+        to_screen: bool = False,
         **kwargs: Any,
     ) -> None:
         super().__init__(**kwargs)
         self._source_node = source_node
+        self._to_screen = to_screen
 
     def run(self, *args: Any, **kwargs: Any) -> List[List[int]]:
         image = self._source_node.run(*args, **kwargs)
+        if image is None:
+            # Finite sources, such as recorded sessions, end with no frame
+            self.state = False
+            return None
+
+        rectangles = super().run(image, *args, **kwargs)
+
+        if not self._to_screen or rectangles is None:
+            return rectangles
+
+        # Sources that capture a screen area report where it starts, so the
+        # rectangles can be translated back into screen coordinates.
+        if isinstance(image, Frame):
+            origin = image.origin
+        else:
+            origin = getattr(self._source_node, "origin", None)
+        if origin is not None and any(origin):
+            rectangles = rectangles + [origin[0], origin[1], 0, 0]
+
+        return rectangles
+
+    def close(self) -> None:
+        self._source_node.close()
+
+
+class TemplateBank(Node):
+    def __init__(
+        self,
+        templates: Dict[str, Union[np.ndarray, str]],
+        return_template_names: Union[str, List[str]] = None,
+        find_any: bool = False,
+        region: Tuple[int, int, int, int] = None,
+        threshold: float = 0.7,
+        single_match: bool = False,
+        method: int = cv2.TM_CCOEFF_NORMED,
+        pyramid_levels: int = 0,
+        refine_margin: int = None,
+        coarse_threshold: float = None,
+        overlap_threshold: float = 0.3,
+        grayscale: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._detections = {
+            name: TemplateDetection(
+                target,
+                threshold=threshold,
+                single_match=single_match,
+                method=method,
+                pyramid_levels=pyramid_levels,
+                refine_margin=refine_margin,
+                coarse_threshold=coarse_threshold,
+                overlap_threshold=overlap_threshold,
+                grayscale=grayscale,
+                name=name,
+            )
+            for name, target in templates.items()
+        }
+        for detection in self._detections.values():
+            _check_region(region, detection._target)
+
+        self._region = region
+        self._pyramid_levels = pyramid_levels
+        self._grayscale = grayscale
+        self._find_any = find_any
+        self.return_template_names = return_template_names
+
+    @property
+    def return_template_names(self) -> List[str]:
+        return self._return_template_names
+
+    @return_template_names.setter
+    def return_template_names(self, value: Union[str, List[str]]) -> None:
+        if isinstance(value, str):
+            value = [value]
+
+        names = list(self._detections) if value is None else value
+        for name in names:
+            if name not in self._detections:
+                raise KeyError(f"TemplateBank has no template named {name}")
+
+        # Larger templates leave smaller score maps and are more selective, so
+        # they are matched first to fail or succeed as early as possible.
+        self._schedule = sorted(
+            names,
+            key=lambda name: -(
+                self._detections[name]._target_width
+                * self._detections[name]._target_height
+            ),
+        )
+        self._return_template_names = value
+
+    @property
+    def templates(self) -> List[str]:
+        return list(self._detections)
+
+    def run(
+        self, image: Union[np.ndarray, Frame, str], *args: Any, **kwargs: Any
+    ) -> Dict[str, np.ndarray]:
+        if isinstance(image, str):
+            image = imread(image)
+            if image is None:
+                raise ValueError("Template Bank image file does not exist")
+
+        image, coarse_image = _views(
+            _crop(image, self._region), self._pyramid_levels, self._grayscale
+        )
+
+        found = {}
+        for name in self._schedule:
+            detection = self._detections[name]
+            rectangles = detection._detect(image, coarse_image)
+
+            if len(rectangles) == 0:
+                if self._find_any:
+                    continue
+
+                self.state = False
+                return None
+
+            if self._region is not None:
+                rectangles = rectangles + [self._region[0], self._region[1], 0, 0]
+
+            found[name] = rectangles[0] if detection._single_match else rectangles
+
+            if self._find_any:
+                break
+
+        if len(found) == 0:
+            self.state = False
+            return None
+
+        self.state = True
+        if self.return_template_names is None:
+            return {name: found[name] for name in self._detections if name in found}
+        elif len(self.return_template_names) == 1:
+            return found[self.return_template_names[0]]
 
-        return super().run(image, *args, **kwargs)
+        return {
+            name: found[name] for name in self.return_template_names if name in found
+        }
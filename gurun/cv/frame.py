@@ -0,0 +1,120 @@
+from typing import Any, Tuple
+
+import threading
+import time
+
+try:
+    import cv2
+    import numpy as np
+except ImportError:
+    raise ImportError(
+        "cv2 is not installed. Please install it with `pip install opencv-python`."
+    )
+
+
+def _read_only(image: np.ndarray) -> np.ndarray:
+    if image.flags.writeable:
+        image = image.view()
+        image.setflags(write=False)
+
+    return image
+
+
+class Frame(object):
+    def __init__(
+        self,
+        image: np.ndarray,
+        origin: Tuple[int, int] = (0, 0),
+        timestamp: float = None,
+    ) -> None:
+        self._image = _read_only(np.asarray(image))
+        self._origin = (int(origin[0]), int(origin[1]))
+        self._timestamp = time.monotonic() if timestamp is None else timestamp
+        self._views = {}
+        self._lock = threading.Lock()
+
+    @property
+    def image(self) -> np.ndarray:
+        return self._image
+
+    @property
+    def origin(self) -> Tuple[int, int]:
+        return self._origin
+
+    @property
+    def timestamp(self) -> float:
+        return self._timestamp
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self._image.shape
+
+    @property
+    def width(self) -> int:
+        return self._image.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self._image.shape[0]
+
+    def __array__(self, dtype: Any = None, copy: Any = None) -> np.ndarray:
+        return self._image if dtype is None else self._image.astype(dtype)
+
+    def __repr__(self) -> str:
+        return (
+            f"Frame(shape={self.shape}, origin={self._origin}, "
+            f"timestamp={self._timestamp})"
+        )
+
+    def _view(self, key: Tuple, build: Any) -> Any:
+        view = self._views.get(key)
+        if view is None:
+            # Views are built outside of the lock; when two threads race, the
+            # first stored result wins and the other one is dropped.
+            view = build()
+            with self._lock:
+                view = self._views.setdefault(key, view)
+
+        return view
+
+    def gray(self) -> np.ndarray:
+        if self._image.ndim == 2:
+            return self._image
+
+        def build() -> np.ndarray:
+            code = (
+                cv2.COLOR_BGRA2GRAY if self._image.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+            )
+            return _read_only(cv2.cvtColor(self._image, code))
+
+        return self._view(("gray",), build)
+
+    def pyramid(self, level: int, gray: bool = False) -> np.ndarray:
+        if level < 0:
+            raise ValueError("level must be a non-negative integer")
+
+        if level == 0:
+            return self.gray() if gray else self._image
+
+        # Each level is derived from the one above it, so every level of the
+        # pyramid is computed at most once per frame.
+        return self._view(
+            ("pyramid", level, gray),
+            lambda: _read_only(cv2.pyrDown(self.pyramid(level - 1, gray))),
+        )
+
+    def crop(self, region: Tuple[int, int, int, int]) -> "Frame":
+        x, y, width, height = (int(value) for value in region)
+
+        return self._view(
+            ("crop", x, y, width, height),
+            lambda: Frame(
+                self._image[y : y + height, x : x + width],
+                origin=(self._origin[0] + x, self._origin[1] + y),
+                timestamp=self._timestamp,
+            ),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._views = {}
@@ -0,0 +1,93 @@
+from typing import Any, Dict, Tuple
+
+import hashlib
+import time
+
+try:
+    import cv2
+    import numpy as np
+except ImportError:
+    raise ImportError(
+        "cv2 is not installed. Please install it with `pip install opencv-python`."
+    )
+
+
+def frame_digest(
+    image: np.ndarray, size: Tuple[int, int] = (64, 36), exact: bool = True
+) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((image.shape, image.dtype.str)).encode())
+
+    if exact:
+        digest.update(np.ascontiguousarray(image).data)
+    else:
+        # Area interpolation averages whole blocks of pixels into each value
+        # of the thumbnail, so a change covering a few pixels, like a blinking
+        # cursor, can round away. It is cheaper to hash than the full frame,
+        # but a memo using it should bound staleness with max_age or max_hits.
+        digest.update(cv2.resize(image, size, interpolation=cv2.INTER_AREA).data)
+
+    return digest.digest()
+
+
+class FrameMemo(object):
+    def __init__(
+        self,
+        size: Tuple[int, int] = (64, 36),
+        exact: bool = True,
+        max_age: float = None,
+        max_hits: int = None,
+    ) -> None:
+        self._size = size
+        self._exact = exact
+        self._max_age = max_age
+        self._max_hits = max_hits
+        self._owner = None
+        self._digest = None
+        self._value = None
+        self._stored_at = 0.0
+        self._consecutive_hits = 0
+        self.hits = 0
+        self.misses = 0
+
+    def attach(self, owner: Any) -> None:
+        # A memo holds the result of one detector, sharing it would return
+        # the rectangles of another template on the same frame.
+        if self._owner is not None and self._owner is not owner:
+            raise ValueError("FrameMemo is already attached to another node")
+
+        self._owner = owner
+
+    def digest(self, image: np.ndarray) -> bytes:
+        return frame_digest(image, self._size, self._exact)
+
+    def get(self, digest: bytes) -> Tuple[bool, Any]:
+        valid = (
+            self._digest == digest
+            and (
+                self._max_age is None
+                or time.monotonic() - self._stored_at < self._max_age
+            )
+            and (self._max_hits is None or self._consecutive_hits < self._max_hits)
+        )
+
+        if not valid:
+            self.misses += 1
+            return False, None
+
+        self.hits += 1
+        self._consecutive_hits += 1
+        return True, self._value
+
+    def put(self, digest: bytes, value: Any) -> None:
+        self._digest = digest
+        self._value = value
+        self._stored_at = time.monotonic()
+        self._consecutive_hits = 0
+
+    def invalidate(self) -> None:
+        self._digest = None
+        self._value = None
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,296 @@
+from typing import Any, Dict, List, Tuple, Union
+
+import itertools
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    raise ImportError("Process detection requires Python 3.8 or newer.")
+
+try:
+    import cv2
+    import numpy as np
+except ImportError:
+    raise ImportError(
+        "cv2 is not installed. Please install it with `pip install opencv-python`."
+    )
+
+from gurun.cv.detection import TemplateDetection, _check_region, _crop, _views
+from gurun.cv.frame import Frame
+from gurun.cv.store import imread
+from gurun.node import Node
+
+# Worker process state, set up once by _init_worker
+_detections = {}
+_pyramid_levels = 0
+_shm = None
+_frame = None
+_generation = None
+
+
+def _init_worker(
+    templates: Dict[str, np.ndarray], pyramid_levels: int, options: Dict[str, Any]
+) -> None:
+    global _detections, _pyramid_levels
+
+    _detections = {
+        name: TemplateDetection(
+            target, pyramid_levels=pyramid_levels, name=name, **options
+        )
+        for name, target in templates.items()
+    }
+    _pyramid_levels = pyramid_levels
+
+
+def _attach(shm_name: str) -> shared_memory.SharedMemory:
+    global _shm, _frame
+
+    if _shm is None or _shm.name != shm_name:
+        if _shm is not None:
+            _frame = None
+            try:
+                _shm.close()
+            except BufferError:
+                pass
+
+        _shm = shared_memory.SharedMemory(name=shm_name)
+
+    return _shm
+
+
+def _match(
+    shm_name: str, shape: Tuple[int, ...], dtype: str, generation: int, name: str
+) -> Tuple[str, np.ndarray]:
+    global _frame, _generation
+
+    shm = _attach(shm_name)
+    if _frame is None or _generation != generation:
+        # Templates handled by the same worker share one Frame per capture,
+        # so its pyramid is only built once in each process.
+        _frame = Frame(np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf))
+        _generation = generation
+
+    coarse_image = _frame.pyramid(_pyramid_levels) if _pyramid_levels > 0 else None
+    return name, _detections[name]._detect(_frame.image, coarse_image)
+
+
+class ProcessTemplateBank(Node):
+    def __init__(
+        self,
+        templates: Dict[str, Union[np.ndarray, str]],
+        return_template_names: Union[str, List[str]] = None,
+        find_any: bool = False,
+        region: Tuple[int, int, int, int] = None,
+        threshold: float = 0.7,
+        single_match: bool = False,
+        method: int = cv2.TM_CCOEFF_NORMED,
+        pyramid_levels: int = 0,
+        refine_margin: int = None,
+        coarse_threshold: float = None,
+        overlap_threshold: float = 0.3,
+        grayscale: bool = False,
+        processes: int = None,
+        mp_context: Any = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        if pyramid_levels < 0:
+            raise ValueError("pyramid_levels must be a non-negative integer")
+
+        flags = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR
+        self._templates = {}
+        for name, target in templates.items():
+            if isinstance(target, str):
+                path, target = target, imread(target, flags)
+                if target is None:
+                    raise ValueError(
+                        f"Template Detection target file {path} does not exist"
+                    )
+
+            _check_region(region, target)
+            self._templates[name] = np.ascontiguousarray(target)
+
+        self._options = {
+            "threshold": threshold,
+            "method": method,
+            "refine_margin": refine_margin,
+            "coarse_threshold": coarse_threshold,
+            "overlap_threshold": overlap_threshold,
+            "grayscale": grayscale,
+        }
+        self._region = region
+        self._single_match = single_match
+        self._pyramid_levels = pyramid_levels
+        self._grayscale = grayscale
+        self._find_any = find_any
+        self._processes = processes
+        self._mp_context = mp_context
+        self._executor = None
+        self._shm = None
+        self._generation = itertools.count()
+        self.return_template_names = return_template_names
+
+    @property
+    def return_template_names(self) -> List[str]:
+        return self._return_template_names
+
+    @return_template_names.setter
+    def return_template_names(self, value: Union[str, List[str]]) -> None:
+        if isinstance(value, str):
+            value = [value]
+
+        names = list(self._templates) if value is None else value
+        for name in names:
+            if name not in self._templates:
+                raise KeyError(f"ProcessTemplateBank has no template named {name}")
+
+        # Larger templates are the slowest to match, so they are submitted
+        # first to keep every worker busy until the end.
+        self._schedule = sorted(
+            names,
+            key=lambda name: -(
+                self._templates[name].shape[0] * self._templates[name].shape[1]
+            ),
+        )
+        self._return_template_names = value
+
+    @property
+    def templates(self) -> List[str]:
+        return list(self._templates)
+
+    def open(self) -> "ProcessTemplateBank":
+        if self._executor is None:
+            context = self._mp_context
+            if isinstance(context, str) or context is None:
+                context = multiprocessing.get_context(context)
+
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._processes,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self._templates, self._pyramid_levels, self._options),
+            )
+
+        return self
+
+    def __enter__(self) -> "ProcessTemplateBank":
+        return self.open()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def _share(self, image: np.ndarray) -> shared_memory.SharedMemory:
+        # The buffer is reused between frames and only reallocated when a
+        # larger one arrives; workers reattach when its name changes.
+        if self._shm is None or self._shm.size < image.nbytes:
+            if self._shm is not None:
+                self._shm.close()
+                self._shm.unlink()
+
+            self._shm = shared_memory.SharedMemory(create=True, size=image.nbytes)
+
+        buffer = np.ndarray(image.shape, dtype=image.dtype, buffer=self._shm.buf)
+        np.copyto(buffer, image)
+        del buffer
+
+        return self._shm
+
+    def run(
+        self, image: Union[np.ndarray, Frame, str], *args: Any, **kwargs: Any
+    ) -> Dict[str, np.ndarray]:
+        if isinstance(image, str):
+            image = imread(image)
+            if image is None:
+                raise ValueError("Template Bank image file does not exist")
+
+        # Cropping and colour conversion happen once here, so the workers
+        # only receive the pixels they actually match against.
+        image, _ = _views(_crop(image, self._region), 0, self._grayscale)
+        shm = self.open()._share(image)
+        task = (shm.name, image.shape, image.dtype.str, next(self._generation))
+
+        pending = {
+            self._executor.submit(_match, *task, name) for name in self._schedule
+        }
+        found = {}
+        missing = False
+        try:
+            while pending and not missing and not (self._find_any and found):
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, rectangles = future.result()
+                    if len(rectangles) > 0:
+                        found[name] = rectangles
+                    elif not self._find_any:
+                        missing = True
+        finally:
+            # Running matches still read the shared buffer, so they must be
+            # finished before the next frame overwrites it.
+            for future in pending:
+                future.cancel()
+            wait(pending)
+
+        if missing or len(found) == 0:
+            self.state = False
+            return None
+
+        for name, rectangles in found.items():
+            if self._region is not None:
+                rectangles = rectangles + [self._region[0], self._region[1], 0, 0]
+
+            found[name] = rectangles[0] if self._single_match else rectangles
+
+        self.state = True
+        if self.return_template_names is None:
+            return {name: found[name] for name in self._templates if name in found}
+        elif len(self.return_template_names) == 1:
+            return found[self.return_template_names[0]]
+
+        return {
+            name: found[name] for name in self.return_template_names if name in found
+        }
+
+
+class ProcessTemplateBankFrom(ProcessTemplateBank):
+    def __init__(
+        self, source_node: Node, to_screen: bool = False, **kwargs: Any
+    ) -> None:
+        super().__init__(**kwargs)
+        self._source_node = source_node
+        self._to_screen = to_screen
+
+    def run(self, *args: Any, **kwargs: Any) -> Dict[str, np.ndarray]:
+        image = self._source_node.run(*args, **kwargs)
+        if image is None:
+            # Finite sources, such as recorded sessions, end with no frame
+            self.state = False
+            return None
+
+        found = super().run(image, *args, **kwargs)
+
+        if isinstance(image, Frame):
+            origin = image.origin
+        else:
+            origin = getattr(self._source_node, "origin", None)
+
+        if not self._to_screen or found is None or origin is None or not any(origin):
+            return found
+
+        offset = [origin[0], origin[1], 0, 0]
+        if isinstance(found, dict):
+            return {name: rectangles + offset for name, rectangles in found.items()}
+
+        return found + offset
+
+    def close(self) -> None:
+        super().close()
+        self._source_node.close()
@@ -0,0 +1,265 @@
+from typing import Any, Iterator, Tuple, Union
+
+import glob
+import os
+import queue
+import re
+import threading
+
+try:
+    import cv2
+    import numpy as np
+except ImportError:
+    raise ImportError(
+        "cv2 is not installed. Please install it with `pip install opencv-python`."
+    )
+
+from gurun.cv.frame import Frame
+from gurun.node import Node
+
+# Marks the end of the stream in the read-ahead queue
+_END = object()
+
+
+def _natural_key(path: str) -> list:
+    # Numbers compare by value, so frame_2 comes before frame_10
+    return [
+        int(part) if part.isdigit() else part
+        for part in re.split(r"(\d+)", os.path.basename(path))
+    ]
+
+
+class _Failure(object):
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+class FrameSource(Node):
+    def __init__(
+        self,
+        prefetch: int = 0,
+        loop: bool = False,
+        frame: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        if prefetch < 0:
+            raise ValueError("prefetch must be a non-negative integer")
+
+        self._prefetch = prefetch
+        self._loop = loop
+        self._frame = frame
+        self._lock = threading.Lock()
+        self._iterator = None
+        self._queue = None
+        self._stop = None
+        self._thread = None
+        self.index = 0
+
+    @property
+    def origin(self) -> Tuple[int, int]:
+        return (0, 0)
+
+    def _frames(self) -> Iterator[np.ndarray]:
+        raise NotImplementedError
+
+    def _stream(self) -> Iterator[np.ndarray]:
+        while True:
+            empty = True
+            for image in self._frames():
+                empty = False
+                yield image
+
+            if not self._loop or empty:
+                return
+
+    def _fetch(self, image: np.ndarray) -> np.ndarray:
+        # Called on the read-ahead thread for every frame it queues
+        return image
+
+    def _read_ahead(
+        self, frames: Iterator[np.ndarray], buffer: queue.Queue, stop: threading.Event
+    ) -> None:
+        def put(item: Any) -> bool:
+            # Blocks while the queue is full, but gives up once the source
+            # is closed so the thread never outlives it.
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+
+            return False
+
+        try:
+            for image in frames:
+                if not put(self._fetch(image)):
+                    return
+        except BaseException as error:
+            put(_Failure(error))
+        else:
+            put(_END)
+        finally:
+            frames.close()
+
+    def open(self) -> "FrameSource":
+        if self._iterator is None:
+            self._iterator = self._stream()
+            if self._prefetch > 0:
+                self._queue = queue.Queue(maxsize=self._prefetch)
+                self._stop = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._read_ahead,
+                    args=(self._iterator, self._queue, self._stop),
+                    name=f"gurun-{self.name}",
+                    daemon=True,
+                )
+                self._thread.start()
+
+        return self
+
+    def close(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                self._stop.set()
+                self._thread.join()
+                self._thread = None
+            elif self._queue is None and self._iterator is not None:
+                self._iterator.close()
+
+            self._iterator = None
+            self._queue = None
+
+    def reset(self) -> None:
+        self.close()
+        self.index = 0
+
+    def __enter__(self) -> "FrameSource":
+        return self.open()
+
+    def _next(self) -> Any:
+        if self._queue is None:
+            return next(self._iterator, _END)
+
+        if self._thread is None:
+            return _END
+
+        item = self._queue.get()
+        if item is _END or isinstance(item, _Failure):
+            # The read-ahead thread has finished, later calls must not wait
+            # on a queue nobody fills anymore.
+            self._thread.join()
+            self._thread = None
+
+        if isinstance(item, _Failure):
+            raise item.error
+
+        return item
+
+    def run(self, *args: Any, **kwargs: Any) -> Union[np.ndarray, Frame]:
+        with self._lock:
+            self.open()
+            image = self._next()
+
+            if image is _END:
+                self.state = False
+                return None
+
+            self.index += 1
+
+        self.state = True
+        if self._frame:
+            return Frame(image, origin=self.origin)
+
+        return image
+
+    def __iter__(self) -> Iterator[Union[np.ndarray, Frame]]:
+        while True:
+            image = self.run()
+            if not self.state:
+                return
+
+            yield image
+
+
+class VideoSource(FrameSource):
+    def __init__(self, path: str, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        if not os.path.isfile(path):
+            raise ValueError(f"Video file {path} does not exist")
+
+        self._path = path
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def _frames(self) -> Iterator[np.ndarray]:
+        capture = cv2.VideoCapture(self._path)
+        try:
+            while True:
+                ok, image = capture.read()
+                if not ok:
+                    return
+
+                yield image
+        finally:
+            capture.release()
+
+
+class ImageDirectorySource(FrameSource):
+    def __init__(
+        self,
+        path: str,
+        pattern: str = "*.png",
+        flags: int = cv2.IMREAD_COLOR,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        if not os.path.isdir(path):
+            raise ValueError(f"Image directory {path} does not exist")
+
+        self._path = path
+        self._pattern = pattern
+        self._flags = flags
+
+    @property
+    def files(self) -> list:
+        return sorted(
+            glob.glob(os.path.join(self._path, self._pattern)), key=_natural_key
+        )
+
+    def _frames(self) -> Iterator[np.ndarray]:
+        for filename in self.files:
+            image = cv2.imread(filename, self._flags)
+            if image is None:
+                raise ValueError(f"Image file {filename} could not be read")
+
+            yield image
+
+
+class NpySource(FrameSource):
+    def __init__(self, path: str, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        if not os.path.isfile(path):
+            raise ValueError(f"Array file {path} does not exist")
+
+        self._path = path
+
+    def __len__(self) -> int:
+        return len(np.load(self._path, mmap_mode="r"))
+
+    def _fetch(self, image: np.ndarray) -> np.ndarray:
+        # Views are only read when used, so the read-ahead thread copies
+        # them to actually load the pages before the frame is needed.
+        return np.array(image)
+
+    def _frames(self) -> Iterator[np.ndarray]:
+        # Frames are views into the memory-mapped file, so only the pages
+        # of the frames actually read are loaded from disk.
+        frames = np.load(self._path, mmap_mode="r")
+        for index in range(len(frames)):
+            yield frames[index]
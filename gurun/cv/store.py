@@ -0,0 +1,117 @@
+from typing import Dict
+
+import os
+import threading
+from collections import OrderedDict
+
+try:
+    import cv2
+    import numpy as np
+except ImportError:
+    raise ImportError(
+        "cv2 is not installed. Please install it with `pip install opencv-python`."
+    )
+
+
+class TemplateStore(object):
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value: int) -> None:
+        with self._lock:
+            self._max_bytes = value
+            self._evict()
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, path: str) -> bool:
+        return any(key[0] == os.path.abspath(path) for key in self._entries)
+
+    def _evict(self) -> None:
+        # The most recently used entry is always kept, even when it alone
+        # exceeds the budget, so a lookup never returns an evicted array.
+        while self._nbytes > self._max_bytes and len(self._entries) > 1:
+            _, (_, image) = self._entries.popitem(last=False)
+            self._nbytes -= image.nbytes
+            self.evictions += 1
+
+    def get(self, path: str, flags: int = cv2.IMREAD_COLOR) -> np.ndarray:
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        # A file rewritten within the mtime granularity keeps its mtime, the
+        # size catches most of those rewrites.
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        key = (path, flags)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        image = cv2.imread(path, flags)
+        if image is None:
+            return None
+
+        image.setflags(write=False)
+
+        with self._lock:
+            self.misses += 1
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._nbytes -= previous[1].nbytes
+
+            self._entries[key] = (signature, image)
+            self._nbytes += image.nbytes
+            self._evict()
+
+        return image
+
+    def discard(self, path: str) -> None:
+        path = os.path.abspath(path)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == path]:
+                _, image = self._entries.pop(key)
+                self._nbytes -= image.nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "nbytes": self._nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+template_store = TemplateStore()
+
+
+def imread(path: str, flags: int = cv2.IMREAD_COLOR) -> np.ndarray:
+    return template_store.get(path, flags)
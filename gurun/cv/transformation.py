@@ -1,8 +1,6 @@
-from typing import Any
-
-import math
-import random
+from typing import Any, List, Union
 
+from gurun.cv.frame import Frame
 from gurun.node import Node
 
 try:
@@ -15,62 +13,95 @@ except ImportError:
 
 
 class Transformation(Node):
-    def run(self, detections: np.ndarray, *args: Any, **kwargs: Any) -> Any:
+    def run(
+        self,
+        detections: np.ndarray,
+        *args: Any,
+        out: np.ndarray = None,
+        frame: Frame = None,
+        **kwargs: Any,
+    ) -> Any:
         if detections is None:
             self.state = False
             return None
 
         self.state = True
-        return self._transform(detections, *args, **kwargs)
-
-    def _transform(self, detections: np.ndarray, *args: Any, **kwargs: Any) -> Any:
-        raise NotImplementedError()
+        return self._transform(detections, *args, out=out, frame=frame, **kwargs)
 
+    def _to_array(self, detections: Any) -> np.ndarray:
+        if isinstance(detections, dict):
+            return np.array([[detections["x"], detections["y"]]])
 
-class RectToPoint(Transformation):
-    def _transform(self, detections: np.ndarray, *args: Any, **kwargs: Any) -> Any:
-        if len(np.shape(detections)) == 1:
-            return {
-                "x": detections[0] + (detections[2] / 2),
-                "y": detections[1] + (detections[3] / 2),
-            }
-        elif len(np.shape(detections)) == 2:
-            return [[r[0] + (r[2] / 2), r[1] + (r[3] / 2)] for r in detections]
-        else:
+        detections = np.asarray(detections)
+        if detections.ndim not in (1, 2):
             raise ValueError(
-                "RectToPoint: Input must be a 1D or 2D array. Input shape: {}".format(
-                    np.shape(detections)
+                "{}: Input must be a 1D or 2D array. Input shape: {}".format(
+                    self.__class__.__name__, np.shape(detections)
                 )
             )
 
+        return np.atleast_2d(detections)
+
+    def _from_array(
+        self, result: np.ndarray, detections: Any, out: np.ndarray = None
+    ) -> Any:
+        if out is not None:
+            out[...] = result.reshape(out.shape)
+            return out
+
+        # Single detections keep their shape: points as {"x", "y"} dicts,
+        # which ravel into pyautogui calls, and rects as 1D arrays.
+        if isinstance(detections, dict) or np.ndim(detections) == 1:
+            if result.shape[1] == 2:
+                return {"x": result[0, 0], "y": result[0, 1]}
+            return result[0]
+
+        return result
+
+    def _apply(self, detections: np.ndarray) -> np.ndarray:
+        raise NotImplementedError()
+
+    def _transform(
+        self,
+        detections: Any,
+        *args: Any,
+        out: np.ndarray = None,
+        frame: Frame = None,
+        **kwargs: Any,
+    ) -> Any:
+        result = self._apply(self._to_array(detections))
+
+        # Detections made on a frame are relative to it; its origin maps them
+        # back into screen coordinates.
+        if frame is not None and any(frame.origin):
+            origin = np.zeros(result.shape[1], dtype=np.result_type(result, 0))
+            origin[:2] = frame.origin
+            result = result + origin
+
+        return self._from_array(result, detections, out)
+
+
+class RectToPoint(Transformation):
+    def _apply(self, detections: np.ndarray) -> np.ndarray:
+        return detections[:, :2] + detections[:, 2:4] / 2
+
 
 class NaturalRectToPoint(Transformation):
-    def __init__(self, border_proportion: float = 0.25, **kwargs: Any):
+    def __init__(
+        self,
+        border_proportion: float = 0.25,
+        seed: Union[int, np.random.Generator] = None,
+        **kwargs: Any,
+    ):
         super().__init__(**kwargs)
         self._border_proportion = border_proportion
+        self._rng = np.random.default_rng(seed)
 
-    def __natural_range(self, value: int, limit: int) -> int:
-        value_start = value + (limit * self._border_proportion)
-        value_end = (value + limit) - (limit * self._border_proportion)
-        return math.floor(random.uniform(value_start, value_end))
-
-    def _transform(self, detections: np.ndarray, *args: Any, **kwargs: Any) -> Any:
-        if len(np.shape(detections)) == 1:
-            return {
-                "x": self.__natural_range(detections[0], detections[2]),
-                "y": self.__natural_range(detections[1], detections[3]),
-            }
-        elif len(np.shape(detections)) == 2:
-            return [
-                [self.__natural_range(r[0], r[2]), self.__natural_range(r[1], r[3])]
-                for r in detections
-            ]
-        else:
-            raise ValueError(
-                "NaturalRectToPoint: Input must be a 1D or 2D array. Input shape: {}".format(
-                    np.shape(detections)
-                )
-            )
+    def _apply(self, detections: np.ndarray) -> np.ndarray:
+        border = detections[:, 2:4] * self._border_proportion
+        low = detections[:, :2] + border
+        high = detections[:, :2] + detections[:, 2:4] - border
+        return np.floor(self._rng.uniform(low, high)).astype(np.int64)
 
 
 class Offset(Transformation):
@@ -79,25 +110,26 @@ class Offset(Transformation):
         self._xOffset = xOffset
         self._yOffset = yOffset
 
-    def _transform(self, detections: np.ndarray, *args: Any, **kwds: Any) -> Any:
-        if isinstance(detections, dict):
-            return {
-                "x": detections["x"] + self._xOffset,
-                "y": detections["y"] + self._yOffset,
-            }
-        elif len(np.shape(detections)) == 1:
-            detections[0] += self._xOffset
-            detections[1] += self._yOffset
-            return detections
-        elif len(np.shape(detections)) == 2:
-            for detection in detections:
-                detection[0] += self._xOffset
-                detection[1] += self._yOffset
-
-            return detections
-        else:
-            raise ValueError(
-                "Offset: Input must be a 1D or 2D array. Input shape: {}".format(
-                    np.shape(detections)
-                )
-            )
+    def _apply(self, detections: np.ndarray) -> np.ndarray:
+        offset = np.zeros(
+            detections.shape[1],
+            dtype=np.result_type(detections, self._xOffset, self._yOffset),
+        )
+        offset[:2] = (self._xOffset, self._yOffset)
+        return detections + offset
+
+
+class TransformationChain(Transformation):
+    def __init__(self, transformations: List[Transformation], **kwargs: Any):
+        super().__init__(**kwargs)
+        self._transformations = transformations
+
+    @property
+    def transformations(self) -> List[Transformation]:
+        return self._transformations
+
+    def _apply(self, detections: np.ndarray) -> np.ndarray:
+        for transformation in self._transformations:
+            detections = transformation._apply(detections)
+
+        return detections
@@ -17,3 +17,6 @@ class ForEachDetection(Node):
     def run(self, detections: np.ndarray, *args, **kwargs) -> None:
         for detection in detections:
             self._node.run(detection, *args, **kwargs)
+
+    def close(self) -> None:
+        self._node.close()
@@ -0,0 +1,25 @@
+from typing import Any
+
+
+def load_pyautogui() -> Any:
+    # pyautogui is slow to import and connects to the display, so it is only
+    # loaded once a node that drives the mouse, keyboard or screen needs it.
+    try:
+        import pyautogui
+    except ImportError:
+        raise ImportError(
+            "pyautogui is not installed. Please install it with `pip install pyautogui`."
+        )
+
+    return pyautogui
+
+
+def load_mss() -> Any:
+    try:
+        import mss
+    except ImportError:
+        raise ImportError(
+            "mss is not installed. Please install it with `pip install mss`."
+        )
+
+    return mss
@@ -2,34 +2,28 @@ from typing import Any, Callable, List
 
 import random
 
+from gurun.gui._backends import load_pyautogui
 from gurun.node import Node, WrapperNode
 
-try:
-    import pyautogui
-except ImportError:
-    raise ImportError(
-        "pyautogui is not installed. Please install it with `pip install pyautogui`."
-    )
-
 
 class Typewrite(WrapperNode):
     def __init__(self, **kwargs: Any) -> None:
-        super().__init__(pyautogui.typewrite, **kwargs)
+        super().__init__(load_pyautogui().typewrite, **kwargs)
 
 
 class Scroll(Node):
     def __init__(self, **kwargs: Any) -> None:
-        super().__init__(pyautogui.scroll, **kwargs)
+        super().__init__(load_pyautogui().scroll, **kwargs)
 
 
 class Click(WrapperNode):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
-        super().__init__(pyautogui.click, **kwargs)
+        super().__init__(load_pyautogui().click, **kwargs)
 
 
 class HotKey(WrapperNode):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
-        super().__init__(pyautogui.hotkey, **kwargs)
+        super().__init__(load_pyautogui().hotkey, **kwargs)
 
 
 class MoveRel(Node):
@@ -44,17 +38,17 @@ class MoveRel(Node):
         self._y = y
 
     def run(self, *args: Any, **kwargs: Any) -> Any:
-        pyautogui.moveRel(self._x, self._y)
+        load_pyautogui().moveRel(self._x, self._y)
 
 
 class MoveTo(WrapperNode):
     def __init__(self, **kwargs: Any) -> None:
-        super().__init__(pyautogui.moveTo, **kwargs)
+        super().__init__(load_pyautogui().moveTo, **kwargs)
 
 
 class DragRel(WrapperNode):
     def __init__(self, **kwargs: Any) -> None:
-        super().__init__(pyautogui.dragRel, **kwargs)
+        super().__init__(load_pyautogui().dragRel, **kwargs)
 
 
 class MultipleClicks(Click):
@@ -66,16 +60,20 @@ class MultipleClicks(Click):
 class NaturalClick(Click):
     def __init__(
         self,
-        easing_functions: List[Callable] = [
-            pyautogui.easeInQuad,
-            pyautogui.easeOutQuad,
-            pyautogui.easeInOutQuad,
-        ],
+        easing_functions: List[Callable] = None,
         minimum_duration: int = 1,
         maximum_duration: int = 1.5,
         **kwargs: Any,
     ) -> None:
         super().__init__(**kwargs)
+        if easing_functions is None:
+            pyautogui = load_pyautogui()
+            easing_functions = [
+                pyautogui.easeInQuad,
+                pyautogui.easeOutQuad,
+                pyautogui.easeInOutQuad,
+            ]
+
         self._easing_functions = easing_functions
         self._minimum_duration = minimum_duration
         self._maximum_duration = maximum_duration
@@ -1,4 +1,7 @@
-from typing import Any
+from typing import Any, Tuple, Union
+
+import threading
+import time
 
 try:
     import cv2
@@ -8,41 +11,149 @@ except ImportError:
         "cv2 is not installed. Please install it with `pip install opencv-python`."
     )
 
-try:
-    import mss
-except ImportError:
-    raise ImportError("mss is not installed. Please install it with `pip install mss`.")
-
-try:
-    import pyautogui
-except ImportError:
-    raise ImportError(
-        "pyautogui is not installed. Please install it with `pip install pyautogui`."
-    )
 
+from gurun.cv.frame import Frame
+from gurun.gui._backends import load_mss, load_pyautogui
 from gurun.node import Node
 
 
 class ScreenshotPAG(Node):
-    def run(self, filename: str = None, *args: Any, **kwargs: Any) -> np.ndarray:
-        image = pyautogui.screenshot()
+    def __init__(
+        self,
+        region: Tuple[int, int, int, int] = None,
+        frame: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._region = region
+        self._frame = frame
+
+    @property
+    def origin(self) -> Tuple[int, int]:
+        return (0, 0) if self._region is None else tuple(self._region[:2])
+
+    def run(
+        self, filename: str = None, *args: Any, **kwargs: Any
+    ) -> Union[np.ndarray, Frame]:
+        timestamp = time.monotonic()
+        image = load_pyautogui().screenshot(region=self._region)
 
         if filename is not None:
             image.save(filename)
 
-        return cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+        output = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+        if self._frame:
+            return Frame(output, origin=self.origin, timestamp=timestamp)
+
+        return output
 
 
 class ScreenshotMMS(Node):
-    def __init__(self, monitor: int = 0, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        monitor: int = 0,
+        region: Tuple[int, int, int, int] = None,
+        frame: bool = False,
+        **kwargs: Any,
+    ) -> None:
         super().__init__(**kwargs)
         self._monitor = monitor
+        self._region = region
+        self._frame = frame
+        # mss handles are bound to the thread that opened them on several
+        # backends, so every thread running the node gets a session of its own.
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+        self._monitors = None
+
+    def _area(self, monitors: list) -> dict:
+        monitor = monitors[self._monitor]
+        if self._region is None:
+            return monitor
+
+        left, top, width, height = self._region
+        return {
+            "left": monitor["left"] + left,
+            "top": monitor["top"] + top,
+            "width": width,
+            "height": height,
+        }
 
-    def run(self, filename: str = None, *args: Any, **kwargs: Any) -> np.ndarray:
-        with mss.mss() as sct:
-            output = np.array(sct.grab(sct.monitors[self._monitor]))[:, :, :3]
+    @property
+    def monitors(self) -> list:
+        if self._monitors is None:
+            # Read through a short-lived session, so looking up the geometry
+            # never leaves a capture session open.
+            with load_mss().mss() as sct:
+                self._monitors = [dict(monitor) for monitor in sct.monitors]
+
+        return self._monitors
+
+    @property
+    def area(self) -> dict:
+        return self._area(self.monitors)
+
+    @property
+    def origin(self) -> Tuple[int, int]:
+        area = self.area
+        return (area["left"], area["top"])
+
+    def _session(self) -> Any:
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = load_mss().mss()
+            self._local.sct = sct
+            with self._lock:
+                self._sessions.append(sct)
+
+        return sct
+
+    def open(self) -> "ScreenshotMMS":
+        self._session()
+        return self
+
+    def close(self) -> None:
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+            self._local = threading.local()
+
+        for sct in sessions:
+            sct.close()
+
+    def __enter__(self) -> "ScreenshotMMS":
+        return self.open()
+
+    def run(
+        self,
+        filename: str = None,
+        *args: Any,
+        out: np.ndarray = None,
+        **kwargs: Any,
+    ) -> Union[np.ndarray, Frame]:
+        sct = self._session()
+        if self._monitors is None:
+            self._monitors = [dict(monitor) for monitor in sct.monitors]
+
+        area = self._area(sct.monitors)
+        timestamp = time.monotonic()
+        shot = sct.grab(area)
+
+        # BGR view over the BGRA grab buffer, no copy is made
+        output = np.frombuffer(shot.raw, dtype=np.uint8).reshape(
+            shot.height, shot.width, 4
+        )[:, :, :3]
+
+        if out is not None:
+            np.copyto(out, output)
+            output = out
 
         if filename is not None:
             cv2.imwrite(filename, output)
 
+        if self._frame:
+            return Frame(
+                output, origin=(area["left"], area["top"]), timestamp=timestamp
+            )
+
         return output
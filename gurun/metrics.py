@@ -0,0 +1,166 @@
+from typing import Any, Dict, Sequence
+
+import bisect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from gurun.node import Node, add_hook, remove_hook
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class NodeMetrics(object):
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.errors = 0
+        self.latency_sum = 0.0
+        # One counter per bucket plus the implicit +Inf bucket
+        self.latency_counts = [0] * (len(buckets) + 1)
+
+    def as_dict(self, buckets: Sequence[float]) -> Dict[str, Any]:
+        cumulative = []
+        total = 0
+        for count in self.latency_counts:
+            total += count
+            cumulative.append(total)
+
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": self.failures,
+            "errors": self.errors,
+            "latency_sum": self.latency_sum,
+            "latency_buckets": dict(zip(list(buckets) + [float("inf")], cumulative)),
+        }
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+class MetricsRegistry(object):
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self._buckets = tuple(sorted(buckets))
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._enabled = False
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def enable(self) -> "MetricsRegistry":
+        add_hook(self)
+        self._enabled = True
+        return self
+
+    def disable(self) -> None:
+        remove_hook(self)
+        self._enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._metrics = {}
+
+    def start(self, node: Node) -> float:
+        return time.perf_counter()
+
+    def finish(self, node: Node, token: float, output: Any, error: Any) -> None:
+        elapsed = time.perf_counter() - token
+        bucket = bisect.bisect_left(self._buckets, elapsed)
+
+        with self._lock:
+            metrics = self._metrics.get(node.name)
+            if metrics is None:
+                metrics = self._metrics[node.name] = NodeMetrics(self._buckets)
+
+            metrics.calls += 1
+            if error is not None:
+                metrics.errors += 1
+                metrics.failures += 1
+            elif node.state:
+                metrics.successes += 1
+            else:
+                metrics.failures += 1
+
+            metrics.latency_sum += elapsed
+            metrics.latency_counts[bucket] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                name: metrics.as_dict(self._buckets)
+                for name, metrics in self._metrics.items()
+            }
+
+    def to_prometheus(self) -> str:
+        snapshot = self.snapshot()
+        lines = []
+
+        counters = (
+            ("gurun_node_calls_total", "calls", "Number of node runs."),
+            ("gurun_node_successes_total", "successes", "Runs ending with state True."),
+            ("gurun_node_failures_total", "failures", "Runs ending with state False."),
+            ("gurun_node_errors_total", "errors", "Runs that raised an exception."),
+        )
+        for metric, key, description in counters:
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} counter")
+            for name, metrics in snapshot.items():
+                lines.append(f'{metric}{{node="{_escape(name)}"}} {metrics[key]}')
+
+        metric = "gurun_node_latency_seconds"
+        lines.append(f"# HELP {metric} Node run latency.")
+        lines.append(f"# TYPE {metric} histogram")
+        for name, metrics in snapshot.items():
+            label = _escape(name)
+            for bound, count in metrics["latency_buckets"].items():
+                lines.append(
+                    f'{metric}_bucket{{node="{label}",le="{_format_bound(bound)}"}} '
+                    f"{count}"
+                )
+            lines.append(f'{metric}_sum{{node="{label}"}} {metrics["latency_sum"]}')
+            lines.append(f'{metric}_count{{node="{label}"}} {metrics["calls"]}')
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        with open(path, "w") as file:
+            file.write(self.to_prometheus())
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                body = registry.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+registry = MetricsRegistry()
+
+
+def enable() -> MetricsRegistry:
+    return registry.enable()
+
+
+def disable() -> None:
+    registry.disable()
@@ -1,11 +1,115 @@
-from typing import Any, Callable, List, Union
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Iterator, List, Union
 
+import asyncio
+import contextvars
+import functools
+import inspect
 import os
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 from gurun.exceptions import GurunTypeError
 
+# Nodes without memory share this read-only mapping instead of holding an
+# empty dict of their own.
+_NO_MEMORY = MappingProxyType({})
+
+_executor = None
+_executor_lock = threading.Lock()
+_worker = threading.local()
+
+
+_hooks = ()
+
+
+def add_hook(hook: Any) -> None:
+    global _hooks
+
+    if hook not in _hooks:
+        _hooks = _hooks + (hook,)
+
+
+def remove_hook(hook: Any) -> None:
+    global _hooks
+
+    _hooks = tuple(other for other in _hooks if other is not hook)
+
+
+def _observe(node: "Node", call: Callable, args: tuple, kwargs: dict) -> Any:
+    hooks = _hooks
+    tokens = [hook.start(node) for hook in hooks]
+    try:
+        output = call(*args, **kwargs)
+    except BaseException as error:
+        for hook, token in zip(hooks, tokens):
+            hook.finish(node, token, None, error)
+        raise
+
+    for hook, token in zip(hooks, tokens):
+        hook.finish(node, token, output, None)
+
+    return output
+
+
+async def _aobserve(node: "Node", call: Callable, args: tuple, kwargs: dict) -> Any:
+    hooks = _hooks
+    tokens = [hook.start(node) for hook in hooks]
+    try:
+        output = await call(*args, **kwargs)
+    except BaseException as error:
+        for hook, token in zip(hooks, tokens):
+            hook.finish(node, token, None, error)
+        raise
+
+    for hook, token in zip(hooks, tokens):
+        hook.finish(node, token, output, None)
+
+    return output
+
+
+# Marks the end of the input in the queues of a streaming NodeSequence
+_STREAM_END = object()
+
+
+class _StreamFailure(object):
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def _mark_worker() -> None:
+    _worker.active = True
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                thread_name_prefix="gurun", initializer=_mark_worker
+            )
+
+    return _executor
+
 
 class _BaseNode(object):
+    # Slots keep large graphs compact. Subclasses that do not declare their
+    # own __slots__ get a regular __dict__ and work as before.
+    __slots__ = (
+        "__output",
+        "state",
+        "__verbose",
+        "__name",
+        "__ravel",
+        "_memory",
+        "_args_memory",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         *,
@@ -16,31 +120,27 @@ class _BaseNode(object):
         ravel: bool = False,
         **memory: Any,
     ) -> None:
+        if not isinstance(default_state, bool):
+            raise GurunTypeError(
+                var_name="state",
+                expected_type="bool",
+                received_type=type(default_state),
+            )
+
         self.__output = default_output
+        # state is a plain slot: nodes write it on every run, so it is only
+        # validated here rather than through a property setter.
         self.state = default_state
         self.verbose = verbose
         self.name = name
         self.ravel = ravel
-        self._memory = memory
+        self._memory = memory or _NO_MEMORY
         self._args_memory = ()
 
     @property
     def output(self) -> Any:
         return self.__output
 
-    @property
-    def state(self) -> bool:
-        return self.__state
-
-    @state.setter
-    def state(self, value: bool) -> None:
-        if not isinstance(value, bool):
-            raise GurunTypeError(
-                var_name="state", expected_type="bool", received_type=type(value)
-            )
-
-        self.__state = value
-
     @property
     def verbose(self) -> int:
         return self.__verbose
@@ -80,55 +180,152 @@ class _BaseNode(object):
 
         self.__ravel = value
 
+    def _log_start(self, args: tuple, kwargs: dict) -> None:
+        if self.verbose > 0:
+            print(f"Running: {self.name}")
+            if self.verbose > 2:
+                print(
+                    f"\tArgs: {args}",
+                    f"Kwargs: {kwargs}",
+                    f"Memory: {dict(self._memory)}",
+                    f"Args Memory: {self._args_memory}",
+                )
+
+    def _log_output(self) -> None:
+        if self.verbose > 1:
+            print(f"\tOutput: {self.__output}")
+
     def _run(self, m: Callable) -> Callable:
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            if self.verbose > 0:
-                print(f"Running: {self.name}")
-                if self.verbose > 2:
-                    print(
-                        f"\tArgs: {args}",
-                        f"Kwargs: {kwargs}",
-                        f"Memory: {self._memory}",
-                        f"Args Memory: {self._args_memory}",
-                    )
-
+            self._log_start(args, kwargs)
             self.__output = m(*self._args_memory, *args, **self._memory, **kwargs)
+            self._log_output()
+
+            return self.__output
 
-            if self.verbose > 1:
-                print(f"\tOutput: {self.__output}")
+        return wrapper
+
+    def _arun(self, m: Callable) -> Callable:
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            self._log_start(args, kwargs)
+            self.__output = await m(*self._args_memory, *args, **self._memory, **kwargs)
+            self._log_output()
 
             return self.__output
 
         return wrapper
 
 
+def _wrap_run(run: Callable) -> Callable:
+    @functools.wraps(run)
+    def wrapper(self: "Node", *args: Any, **kwargs: Any) -> Any:
+        # Calls made through super() reach a wrapper that is not the one
+        # resolved for the instance and run the raw method, as before.
+        if type(self).run is not wrapper:
+            return run(self, *args, **kwargs)
+
+        if self._BaseNode__verbose or _hooks:
+            return _observe(self, self._run(run.__get__(self)), args, kwargs)
+
+        if self._args_memory or self._memory:
+            output = run(self, *self._args_memory, *args, **self._memory, **kwargs)
+        else:
+            output = run(self, *args, **kwargs)
+
+        self._BaseNode__output = output
+        return output
+
+    wrapper._gurun_run = run
+    return wrapper
+
+
+def _wrap_arun(arun: Callable) -> Callable:
+    @functools.wraps(arun)
+    async def wrapper(self: "Node", *args: Any, **kwargs: Any) -> Any:
+        if type(self).arun is not wrapper:
+            return await arun(self, *args, **kwargs)
+
+        if self._BaseNode__verbose or _hooks:
+            return await _aobserve(self, self._arun(arun.__get__(self)), args, kwargs)
+
+        if self._args_memory or self._memory:
+            output = await arun(
+                self, *self._args_memory, *args, **self._memory, **kwargs
+            )
+        else:
+            output = await arun(self, *args, **kwargs)
+
+        self._BaseNode__output = output
+        return output
+
+    wrapper._gurun_run = arun
+    return wrapper
+
+
 class Node(_BaseNode):
-    def __getattribute__(self, attr):
-        attribute = super().__getattribute__(attr)
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
 
-        if attr == "run":
-            return self._run(attribute)
+        run = cls.__dict__.get("run")
+        if run is not None and not hasattr(run, "_gurun_run"):
+            cls.run = _wrap_run(run)
 
-        return attribute
+        arun = cls.__dict__.get("arun")
+        if arun is not None and not hasattr(arun, "_gurun_run"):
+            cls.arun = _wrap_arun(arun)
 
+    @_wrap_run
     def run(self, *args: Any, **kwargs: Any) -> Any:
         raise NotImplementedError
 
+    @_wrap_arun
+    async def arun(self, *args: Any, **kwargs: Any) -> Any:
+        # Blocking nodes run on the loop's default executor. Memory was
+        # already injected by the arun wrapper, so the raw run is called.
+        run = functools.partial(
+            contextvars.copy_context().run,
+            type(self).run._gurun_run,
+            self,
+            *args,
+            **kwargs,
+        )
+        return await asyncio.get_running_loop().run_in_executor(None, run)
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "Node":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
 
 class ConstantNode(Node):
+    __slots__ = ()
+
     def __init__(self, default_output: Any, **kwargs: Any) -> None:
         super().__init__(default_output=default_output, **kwargs)
 
     def run(self, *args: Any, **kwargs: Any) -> Any:
         return self.output
 
+    async def arun(self, *args: Any, **kwargs: Any) -> Any:
+        return self.output
+
 
 class NullNode(ConstantNode):
+    __slots__ = ()
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(default_output=None, *args, **kwargs)
 
 
 class WrapperNode(Node):
+    __slots__ = ("_func",)
+
     def __init__(self, func: Callable, **kwargs: Any):
         super().__init__(**kwargs)
         self._func = func
@@ -140,8 +337,20 @@ class WrapperNode(Node):
         except:
             self.state = False
 
+    async def arun(self, *args: Any, **kwargs: Any) -> Any:
+        if not inspect.iscoroutinefunction(self._func):
+            return await super().arun(*args, **kwargs)
+
+        try:
+            self.state = True
+            return await self._func(*args, **kwargs)
+        except:
+            self.state = False
+
 
 class NodeSet(Node):
+    __slots__ = ("_nodes",)
+
     def __init__(
         self,
         nodes: Union[Node, List[Node]] = [],
@@ -177,8 +386,18 @@ class NodeSet(Node):
         for node in self.nodes:
             node.run()
 
+    async def arun(self, *args: Any, **kwargs: Any) -> None:
+        for node in self.nodes:
+            await node.arun()
+
+    def close(self) -> None:
+        for node in self.nodes:
+            node.close()
+
 
 class NodeSequence(NodeSet):
+    __slots__ = ("_ignore_none_output",)
+
     def __init__(
         self,
         nodes: Union[Node, List[Node]] = [],
@@ -226,16 +445,211 @@ class NodeSequence(NodeSet):
 
         return output
 
+    async def arun(self, *args: Any, **kwargs: Any) -> Any:
+        output = None
+        first = True
+        ravel = False
+        for node in self.nodes:
+            if first:
+                output = await node.arun(*args, **kwargs)
+                first = False
+            elif output is None and self.ignore_none_output:
+                output = await node.arun()
+            elif ravel:
+                output = await node.arun(**output)
+            else:
+                output = await node.arun(output)
+
+            self.state = node.state
+            ravel = node.ravel
+
+            if not node.state:
+                return output
+
+        return output
+
+    def _step(
+        self, index: int, node: Node, item: list, args: tuple, kwargs: dict
+    ) -> None:
+        # item holds [output, state, ravel] of one input, updated in place
+        # with the same rules run() applies between consecutive nodes.
+        if index == 0:
+            output = node.run(item[0], *args, **kwargs)
+        elif item[0] is None and self._ignore_none_output:
+            output = node.run()
+        elif item[2]:
+            output = node.run(**item[0])
+        else:
+            output = node.run(item[0])
+
+        item[0] = output
+        item[1] = node.state
+        item[2] = node.ravel
+
+    def _emit(self, item: list) -> Any:
+        self.state = item[1]
+        self._BaseNode__output = item[0]
+        return item[0]
+
+    def stream(
+        self,
+        iterable: Iterable[Any],
+        *args: Any,
+        parallel: bool = False,
+        max_in_flight: int = None,
+        **kwargs: Any,
+    ) -> Iterator[Any]:
+        nodes = list(self.nodes)
+        if max_in_flight is None:
+            max_in_flight = 2 * max(len(nodes), 1)
+        elif max_in_flight < 1:
+            raise ValueError("max_in_flight must be a positive integer")
+
+        if parallel and len(nodes) > 1:
+            return self._stream_parallel(iterable, nodes, max_in_flight, args, kwargs)
+
+        return self._stream(iterable, nodes, args, kwargs)
+
+    def _stream(
+        self, iterable: Iterable[Any], nodes: List[Node], args: tuple, kwargs: dict
+    ) -> Iterator[Any]:
+        if len(nodes) == 0:
+            for _ in iterable:
+                yield self._emit([None, self.state])
+            return
+
+        # Same rules as run(), with the lookups hoisted out of the item loop
+        first, rest = nodes[0], nodes[1:]
+        ignore_none_output = self._ignore_none_output
+        for value in iterable:
+            output = first.run(value, *args, **kwargs)
+            state = first.state
+            ravel = first.ravel
+            if state:
+                for node in rest:
+                    if output is None and ignore_none_output:
+                        output = node.run()
+                    elif ravel:
+                        output = node.run(**output)
+                    else:
+                        output = node.run(output)
+
+                    state = node.state
+                    ravel = node.ravel
+                    if not state:
+                        break
+
+            self.state = state
+            self._BaseNode__output = output
+            yield output
+
+    def _stream_parallel(
+        self,
+        iterable: Iterable[Any],
+        nodes: List[Node],
+        max_in_flight: int,
+        args: tuple,
+        kwargs: dict,
+    ) -> Iterator[Any]:
+        # Every node runs on its own thread and handles one item at a time,
+        # so node state is never shared between items in flight. The
+        # semaphore bounds the items between the feeder and the consumer.
+        limit = threading.Semaphore(max_in_flight)
+        stop = threading.Event()
+        queues = [queue.SimpleQueue() for _ in range(len(nodes) + 1)]
+
+        def get(source: queue.SimpleQueue) -> Any:
+            while not stop.is_set():
+                try:
+                    return source.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+            return _STREAM_END
+
+        def feed() -> None:
+            try:
+                for value in iterable:
+                    while not limit.acquire(timeout=0.1):
+                        if stop.is_set():
+                            return
+
+                    queues[0].put([value, True, False])
+            except BaseException as error:
+                queues[0].put(_StreamFailure(error))
+            else:
+                queues[0].put(_STREAM_END)
+
+        def stage(index: int, node: Node) -> None:
+            source, sink = queues[index], queues[index + 1]
+            while True:
+                item = get(source)
+                if item is _STREAM_END or isinstance(item, _StreamFailure):
+                    sink.put(item)
+                    return
+
+                if item[1]:
+                    try:
+                        self._step(index, node, item, args, kwargs)
+                    except BaseException as error:
+                        sink.put(_StreamFailure(error))
+                        return
+
+                sink.put(item)
+
+        # Each thread runs in a copy of the caller's context, so stages see
+        # e.g. the current tick.
+        threads = [
+            threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(feed,),
+                name="gurun-stream",
+                daemon=True,
+            )
+        ]
+        for index, node in enumerate(nodes):
+            threads.append(
+                threading.Thread(
+                    target=contextvars.copy_context().run,
+                    args=(stage, index, node),
+                    name=f"gurun-{node.name}",
+                    daemon=True,
+                )
+            )
+
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = get(queues[-1])
+                if item is _STREAM_END:
+                    return
+
+                if isinstance(item, _StreamFailure):
+                    raise item.error
+
+                limit.release()
+                yield self._emit(item)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
 
 class UnionNode(NodeSequence):
+    __slots__ = ("_return_node_names", "_parallel")
+
     def __init__(
         self,
         nodes: Union[Node, List[Node]] = [],
         return_node_names: Union[str, List[str]] = None,
+        parallel: bool = False,
         **kwargs: Any,
     ):
         super().__init__(nodes=nodes, **kwargs)
         self.return_node_names = return_node_names
+        self.parallel = parallel
 
     @property
     def return_node_names(self) -> List[Node]:
@@ -248,34 +662,174 @@ class UnionNode(NodeSequence):
 
         self._return_node_names = return_node_names
 
+    @property
+    def parallel(self) -> bool:
+        return self._parallel
+
+    @parallel.setter
+    def parallel(self, value: bool) -> None:
+        if not isinstance(value, bool):
+            raise GurunTypeError(
+                var_name="parallel", expected_type="bool", received_type=type(value)
+            )
+
+        self._parallel = value
+
+    def _run_parallel(self, *args: Any, **kwargs: Any) -> List[Any]:
+        executor = _get_executor()
+        # Each child sees the caller's context, e.g. the current tick
+        futures = [
+            executor.submit(contextvars.copy_context().run, node.run, *args, **kwargs)
+            for node in self.nodes
+        ]
+        nodes = dict(zip(futures, self.nodes))
+
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None or not nodes[future].state:
+                    # Children that already started keep running in the pool,
+                    # the ones still queued are dropped.
+                    for other in pending:
+                        other.cancel()
+
+                    future.result()
+                    return None
+
+        return [future.result() for future in futures]
+
+    def _select(self, output: dict) -> Any:
+        if self.return_node_names is None:
+            return output
+        elif len(self.return_node_names) == 1:
+            if self.return_node_names[0] not in output:
+                return None
+            return output[self.return_node_names[0]]
+        return {index: output[index] for index in self.return_node_names}
+
+    def _collect(self, results: List[Any]) -> dict:
+        return {
+            node.name: result
+            for node, result in zip(self.nodes, results)
+            if not (result is None and self.ignore_none_output)
+        }
+
     def run(
         self,
         *args: Any,
         **kwargs: Any,
     ) -> Any:
+        return self._evaluate(self.parallel, args, kwargs)
+
+    def _evaluate(self, parallel: bool, args: tuple, kwargs: dict) -> Any:
         output = {}
         self.state = True
-        for node in self.nodes:
-            result = node.run(*args, **kwargs)
-
-            if not (result is None and self.ignore_none_output):
-                output[node.name] = result
 
-            if not node.state:
-                output = None
+        # Nested parallel unions run inline on the worker thread, so they
+        # cannot starve the shared pool waiting on their own children.
+        if parallel and len(self.nodes) > 1 and not getattr(_worker, "active", False):
+            results = self._run_parallel(*args, **kwargs)
+            if results is None:
                 self.state = False
                 return None
 
-        if self.return_node_names is None:
-            return output
-        elif len(self.return_node_names) == 1:
-            if self.return_node_names[0] not in output:
+            output = self._collect(results)
+        else:
+            for node in self.nodes:
+                result = node.run(*args, **kwargs)
+
+                if not (result is None and self.ignore_none_output):
+                    output[node.name] = result
+
+                if not node.state:
+                    output = None
+                    self.state = False
+                    return None
+
+        return self._select(output)
+
+    async def _arun_parallel(self, *args: Any, **kwargs: Any) -> List[Any]:
+        tasks = [
+            asyncio.ensure_future(node.arun(*args, **kwargs)) for node in self.nodes
+        ]
+        nodes = dict(zip(tasks, self.nodes))
+
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is not None or not nodes[task].state:
+                    for other in pending:
+                        other.cancel()
+
+                    task.result()
+                    return None
+
+        return [task.result() for task in tasks]
+
+    async def arun(self, *args: Any, **kwargs: Any) -> Any:
+        output = {}
+        self.state = True
+
+        if self.parallel and len(self.nodes) > 1:
+            results = await self._arun_parallel(*args, **kwargs)
+            if results is None:
+                self.state = False
                 return None
-            return output[self.return_node_names[0]]
-        return {index: output[index] for index in self.return_node_names}
+
+            output = self._collect(results)
+        else:
+            for node in self.nodes:
+                result = await node.arun(*args, **kwargs)
+
+                if not (result is None and self.ignore_none_output):
+                    output[node.name] = result
+
+                if not node.state:
+                    self.state = False
+                    return None
+
+        return self._select(output)
+
+    def stream(
+        self,
+        iterable: Iterable[Any],
+        *args: Any,
+        parallel: bool = None,
+        max_in_flight: int = None,
+        **kwargs: Any,
+    ) -> Iterator[Any]:
+        if parallel is not None and not isinstance(parallel, bool):
+            raise GurunTypeError(
+                var_name="parallel", expected_type="bool", received_type=type(parallel)
+            )
+
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("max_in_flight must be a positive integer")
+
+        return self._stream_union(
+            iterable, self.parallel if parallel is None else parallel, args, kwargs
+        )
+
+    def _stream_union(
+        self, iterable: Iterable[Any], parallel: bool, args: tuple, kwargs: dict
+    ) -> Iterator[Any]:
+        # Every child sees the same input, so there are no stages to
+        # pipeline. Items run one at a time, which always stays within
+        # max_in_flight, and parallel runs the children of each item
+        # concurrently.
+        for value in iterable:
+            output = self._evaluate(parallel, (value, *args), kwargs)
+            self._BaseNode__output = output
+            yield output
 
 
 class BranchNode(Node):
+    __slots__ = ("_trigger", "_positive", "_negative", "_ignore_none_output")
+
     def __init__(
         self,
         trigger: Node,
@@ -365,3 +919,22 @@ class BranchNode(Node):
             self.state = self.negative.state
 
         return output
+
+    async def arun(self, *args: Any, **kwargs: Any) -> Any:
+        trigger_result = await self.trigger.arun(*args, **kwargs)
+        branch = self.positive if self.trigger.state else self.negative
+
+        if trigger_result is None and self.ignore_none_output:
+            output = await branch.arun()
+        elif self.trigger.ravel:
+            output = await branch.arun(**trigger_result)
+        else:
+            output = await branch.arun(trigger_result)
+        self.state = branch.state
+
+        return output
+
+    def close(self) -> None:
+        self.trigger.close()
+        self.positive.close()
+        self.negative.close()
@@ -1,5 +1,11 @@
-from typing import List
+from typing import Any, Dict, List, Tuple, Union
 
+import asyncio
+import heapq
+import random
+import time
+
+from gurun.context import tick
 from gurun.exceptions import RunnerException
 from gurun.node import BranchNode, Node, NodeSet, NullNode
 from gurun.utils import RaiseException, Sleep
@@ -31,16 +37,199 @@ class Runner(NodeSet):
         )
 
     def run(self, *args, **kwargs) -> None:
-        self._start_node.run()
+        try:
+            self._start_node.run()
+
+            try:
+                while True:
+                    for node in self.nodes:
+                        # A tick per node, so nodes sharing a frame bus see a
+                        # capture taken after the previous interval.
+                        with tick():
+                            node.run()
+
+                        self._interval_node.run()
+
+            except KeyboardInterrupt:
+                print("Interrupted!")
+
+            self._end_node.run()
+        finally:
+            self.close()
 
+    async def arun(self, *args, **kwargs) -> None:
         try:
-            while True:
-                for node in self.nodes:
-                    node.run()
+            await self._start_node.arun()
+
+            try:
+                while True:
+                    for node in self.nodes:
+                        # A tick per node, so nodes sharing a frame bus see a
+                        # capture taken after the previous interval.
+                        with tick():
+                            await node.arun()
+
+                        await self._interval_node.arun()
+
+            except KeyboardInterrupt:
+                print("Interrupted!")
+
+            await self._end_node.arun()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        super().close()
+        self._start_node.close()
+        self._end_node.close()
+
+
+class AsyncRunner(NodeSet):
+    def __init__(self, runners: List[Runner], **kwargs) -> None:
+        super().__init__(runners, **kwargs)
+
+    def run(self, *args, **kwargs) -> None:
+        asyncio.run(self.arun())
+
+    async def arun(self, *args, **kwargs) -> None:
+        await asyncio.gather(*(runner.arun() for runner in self.nodes))
+
+
+class ScheduledRunner(Runner):
+    def __init__(
+        self,
+        nodes: List[Union[Node, Tuple[Node, float], Tuple[Node, float, float]]],
+        start_node: Node = None,
+        end_node: Node = None,
+        interval: float = 5,
+        jitter: float = 0,
+        **kwargs,
+    ) -> None:
+        entries = [entry if isinstance(entry, tuple) else (entry,) for entry in nodes]
+        tasks = [
+            (
+                entry[1] if len(entry) > 1 else interval,
+                entry[2] if len(entry) > 2 else jitter,
+            )
+            for entry in entries
+        ]
+
+        for task_interval, task_jitter in tasks:
+            if task_interval < 0 or task_jitter < 0:
+                raise ValueError("Scheduled intervals and jitters must be non-negative")
+
+        super().__init__(
+            [entry[0] for entry in entries],
+            start_node=start_node,
+            end_node=end_node,
+            interval=interval,
+            **kwargs,
+        )
+        self._tasks = tasks
+        self._heap = []
+        self._stats = [self._empty_stats() for _ in tasks]
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, float]:
+        return {"runs": 0, "missed": 0, "total_drift": 0.0, "max_drift": 0.0}
+
+    @property
+    def stats(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": node.name,
+                "interval": interval,
+                "jitter": jitter,
+                "runs": stats["runs"],
+                "missed": stats["missed"],
+                "mean_drift": (
+                    stats["total_drift"] / stats["runs"] if stats["runs"] else 0.0
+                ),
+                "max_drift": stats["max_drift"],
+            }
+            for node, (interval, jitter), stats in zip(
+                self.nodes, self._tasks, self._stats
+            )
+        ]
+
+    def _schedule(self) -> None:
+        now = time.monotonic()
+        self._heap = [(now, index) for index in range(len(self.nodes))]
+        self._stats = [self._empty_stats() for _ in self._tasks]
+
+    def _delay(self) -> float:
+        return self._heap[0][0] - time.monotonic()
+
+    def _pop(self) -> Tuple[float, int]:
+        due, index = heapq.heappop(self._heap)
+
+        stats = self._stats[index]
+        drift = time.monotonic() - due
+        stats["runs"] += 1
+        stats["total_drift"] += drift
+        stats["max_drift"] = max(stats["max_drift"], drift)
+
+        return due, index
+
+    def _push(self, due: float, index: int) -> None:
+        interval, jitter = self._tasks[index]
+        period = interval + (random.uniform(0, jitter) if jitter else 0)
+        due += period
+
+        # Deadlines that passed while the node ran are skipped rather than
+        # replayed, keeping the task on its original phase.
+        now = time.monotonic()
+        if due < now:
+            skipped = int((now - due) // period) + 1 if period > 0 else 0
+            self._stats[index]["missed"] += skipped
+            due = due + skipped * period if period > 0 else now
+
+        heapq.heappush(self._heap, (due, index))
+
+    def run(self, *args, **kwargs) -> None:
+        try:
+            self._start_node.run()
+
+            try:
+                self._schedule()
+                while self._heap:
+                    delay = self._delay()
+                    if delay > 0:
+                        time.sleep(delay)
+                        continue
+
+                    due, index = self._pop()
+                    with tick():
+                        self.nodes[index].run()
+                    self._push(due, index)
+
+            except KeyboardInterrupt:
+                print("Interrupted!")
+
+            self._end_node.run()
+        finally:
+            self.close()
+
+    async def arun(self, *args, **kwargs) -> None:
+        try:
+            await self._start_node.arun()
+
+            try:
+                self._schedule()
+                while self._heap:
+                    delay = self._delay()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                        continue
 
-                    self._interval_node.run()
+                    due, index = self._pop()
+                    with tick():
+                        await self.nodes[index].arun()
+                    self._push(due, index)
 
-        except KeyboardInterrupt:
-            print("Interrupted!")
+            except KeyboardInterrupt:
+                print("Interrupted!")
 
-        self._end_node.run()
+            await self._end_node.arun()
+        finally:
+            self.close()
@@ -0,0 +1,119 @@
+from typing import Any, Dict, List
+
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from gurun.node import Node, add_hook, remove_hook
+
+_current_span: ContextVar = ContextVar("gurun_span", default=None)
+
+
+class Span(object):
+    __slots__ = ("id", "parent_id", "sampled", "start")
+
+    def __init__(self, id: int, parent_id: int, sampled: bool) -> None:
+        self.id = id
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.start = time.perf_counter_ns()
+
+
+def _output_size(output: Any) -> Any:
+    if output is None:
+        return 0
+
+    nbytes = getattr(output, "nbytes", None)
+    if nbytes is not None:
+        return int(nbytes)
+
+    try:
+        return len(output)
+    except TypeError:
+        return None
+
+
+class Tracer(object):
+    def __init__(self, max_events: int = 100_000, sample_rate: float = 1.0) -> None:
+        self._events = deque(maxlen=max_events)
+        self._sample_rate = sample_rate
+        self._ids = itertools.count(1)
+        self._pid = os.getpid()
+
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        return list(self._events)
+
+    def enable(self) -> "Tracer":
+        add_hook(self)
+        return self
+
+    def disable(self) -> None:
+        remove_hook(self)
+
+    def __enter__(self) -> "Tracer":
+        return self.enable()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.disable()
+
+    def clear(self) -> None:
+        self._events.clear()
+
+    def start(self, node: Node) -> Any:
+        parent = _current_span.get()
+        if parent is None:
+            # Sampling is decided once per root span, so sampled ticks are
+            # always recorded with all of their children.
+            sampled = self._sample_rate >= 1 or random.random() < self._sample_rate
+            span = Span(next(self._ids), None, sampled)
+        else:
+            span = Span(next(self._ids), parent.id, parent.sampled)
+
+        return span, _current_span.set(span)
+
+    def finish(self, node: Node, token: Any, output: Any, error: Any) -> None:
+        span, context_token = token
+        end = time.perf_counter_ns()
+
+        try:
+            _current_span.reset(context_token)
+        except ValueError:
+            pass
+
+        if not span.sampled:
+            return
+
+        args = {
+            "span_id": span.id,
+            "parent_id": span.parent_id,
+            "state": node.state,
+            "output_size": _output_size(output),
+        }
+        if error is not None:
+            args["error"] = repr(error)
+
+        self._events.append(
+            {
+                "name": node.name,
+                "cat": type(node).__name__,
+                "ph": "X",
+                "ts": span.start / 1000,
+                "dur": (end - span.start) / 1000,
+                "pid": self._pid,
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+        )
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        return {"traceEvents": self.events, "displayTimeUnit": "ms"}
+
+    def export(self, path: str) -> None:
+        with open(path, "w") as file:
+            json.dump(self.to_chrome_trace(), file)
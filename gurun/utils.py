@@ -1,8 +1,16 @@
-from typing import Any
+from typing import Any, Callable, Dict, Tuple
 
+import asyncio
+import copy
+import hashlib
+import os
+import pickle
 import random
+import threading
 import time
+from collections import OrderedDict
 
+from gurun.context import tick
 from gurun.node import Node, WrapperNode
 
 
@@ -11,6 +19,10 @@ class Sleep(WrapperNode):
         super().__init__(time.sleep, **kwargs)
         self._args_memory = (interval,)
 
+    async def arun(self, interval: int, *args: Any, **kwargs: Any) -> None:
+        self.state = True
+        await asyncio.sleep(interval)
+
 
 class RaiseException(Node):
     def __init__(self, exception: Exception, **kwargs: Any):
@@ -20,6 +32,9 @@ class RaiseException(Node):
     def run(self, *args: Any, **kwargs: Any) -> None:
         raise self._exception
 
+    async def arun(self, *args: Any, **kwargs: Any) -> None:
+        raise self._exception
+
 
 class Periodic(Node):
     def __init__(self, node: Node, interval: int, **kwargs: Any):
@@ -40,6 +55,21 @@ class Periodic(Node):
 
         return output
 
+    async def arun(self, *args: Any, **kwargs: Any) -> Any:
+        if time.time() - self._last_run < self._interval:
+            self.state = False
+            return None
+
+        output = await self._node.arun(*args, **kwargs)
+        self.state = self._node.state
+        if self.state:
+            self._last_run = time.time()
+
+        return output
+
+    def close(self) -> None:
+        self._node.close()
+
 
 class RandomPeriodic(Periodic):
     def __init__(
@@ -57,24 +87,163 @@ class RandomPeriodic(Periodic):
         self._interval = random.randint(self._min_interval, self._max_interval)
         return super().run(*args, **kwargs)
 
+    async def arun(self, *args: Any, **kwargs: Any) -> Any:
+        self._interval = random.randint(self._min_interval, self._max_interval)
+        return await super().arun(*args, **kwargs)
+
+
+class Poll(object):
+    def start(self) -> "Poll":
+        # Wait and While poll through a fresh copy on every run, so a poll
+        # shared between nodes, or between concurrent runs of one node, never
+        # mixes the backoff or change tracking of different waits.
+        poll = copy.copy(self)
+        poll.reset()
+        return poll
+
+    def reset(self) -> None:
+        pass
+
+    def delay(self) -> float:
+        return 0.0
+
+    def ready(self, *args: Any, **kwargs: Any) -> bool:
+        return True
+
+    async def aready(self, *args: Any, **kwargs: Any) -> bool:
+        return self.ready(*args, **kwargs)
+
+
+class FixedPoll(Poll):
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+
+    def delay(self) -> float:
+        return self._interval
+
+
+class BackoffPoll(Poll):
+    def __init__(
+        self, initial: float = 0.01, factor: float = 2.0, maximum: float = 1.0
+    ) -> None:
+        self._initial = initial
+        self._factor = factor
+        self._maximum = maximum
+        self._current = initial
+
+    def reset(self) -> None:
+        self._current = self._initial
+
+    def delay(self) -> float:
+        delay = self._current
+        self._current = min(self._current * self._factor, self._maximum)
+        return delay
+
+
+def _fingerprint(value: Any) -> Any:
+    if not hasattr(value, "__array_interface__") and hasattr(value, "__array__"):
+        # Array wrappers such as gurun.cv.frame.Frame compare by their pixels
+        value = value.__array__()
+
+    if hasattr(value, "__array_interface__") and hasattr(value, "tobytes"):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((value.shape, value.dtype.str)).encode())
+        digest.update(value.tobytes())
+        return digest.digest()
+
+    return value
+
+
+class ChangePoll(Poll):
+    def __init__(
+        self, probe: Node, interval: float = 0.05, key: Callable = None
+    ) -> None:
+        self._probe = probe
+        self._interval = interval
+        self._key = _fingerprint if key is None else key
+        self._last = None
+
+    def reset(self) -> None:
+        self._last = None
+
+    def delay(self) -> float:
+        return self._interval
+
+    def _changed(self, output: Any) -> bool:
+        key = self._key(output)
+        changed = self._last is None or key != self._last
+        self._last = key
+        return changed
+
+    def ready(self, *args: Any, **kwargs: Any) -> bool:
+        return self._changed(self._probe.run(*args, **kwargs))
+
+    async def aready(self, *args: Any, **kwargs: Any) -> bool:
+        return self._changed(await self._probe.arun(*args, **kwargs))
+
+
+async def _asleep(delay: float, deadline: float) -> None:
+    # Always yield, so nodes completing inline let other workflows run
+    await asyncio.sleep(max(min(delay, deadline - time.monotonic()), 0))
+
+
+def _sleep(delay: float, deadline: float) -> None:
+    delay = min(delay, deadline - time.monotonic())
+    if delay > 0:
+        time.sleep(delay)
+
 
 class Wait(Node):
-    def __init__(self, node: Node, timeout: int, **kwargs: Any):
+    def __init__(self, node: Node, timeout: int, poll: Poll = None, **kwargs: Any):
         super().__init__(**kwargs)
         self._node = node
         self._timeout = timeout
+        self._poll = Poll() if poll is None else poll
+        self.elapsed = None
 
     def run(self, *args: Any, **kwargs: Any) -> Any:
-        start = time.time()
-        while time.time() - start < self._timeout:
-            self._node.run(*args, **kwargs)
-            if self._node.state:
-                self.state = True
-                return self._node.output
+        start = time.monotonic()
+        deadline = start + self._timeout
+        poll = self._poll.start()
+        while time.monotonic() < deadline:
+            # Every attempt is a tick of its own, so frame buses capture a
+            # new frame instead of replaying the one of the enclosing tick.
+            with tick():
+                if poll.ready(*args, **kwargs):
+                    self._node.run(*args, **kwargs)
+                    if self._node.state:
+                        self.elapsed = time.monotonic() - start
+                        self.state = True
+                        return self._node.output
+
+            _sleep(poll.delay(), deadline)
+
+        self.elapsed = None
+        self.state = False
+        return None
 
+    async def arun(self, *args: Any, **kwargs: Any) -> Any:
+        start = time.monotonic()
+        deadline = start + self._timeout
+        poll = self._poll.start()
+        while time.monotonic() < deadline:
+            with tick():
+                if await poll.aready(*args, **kwargs):
+                    await self._node.arun(*args, **kwargs)
+                    if self._node.state:
+                        self.elapsed = time.monotonic() - start
+                        self.state = True
+                        return self._node.output
+
+            await _asleep(poll.delay(), deadline)
+
+        self.elapsed = None
         self.state = False
         return None
 
+    def close(self) -> None:
+        self._node.close()
+
 
 class NotNode(Node):
     def __init__(self, node: Node, **kwargs: Any):
@@ -86,27 +255,310 @@ class NotNode(Node):
         self.state = not self._node.state
         return output
 
+    async def arun(self, *args: Any, **kwargs: Any) -> bool:
+        output = await self._node.arun(*args, **kwargs)
+        self.state = not self._node.state
+        return output
+
+    def close(self) -> None:
+        self._node.close()
+
 
 class While(Node):
-    def __init__(self, trigger: Node, action: Node, timeout: int, **kwargs: Any):
+    def __init__(
+        self,
+        trigger: Node,
+        action: Node,
+        timeout: int,
+        poll: Poll = None,
+        **kwargs: Any,
+    ):
         super().__init__(**kwargs)
         self._trigger = trigger
         self._action = action
         self._timeout = timeout
+        self._poll = Poll() if poll is None else poll
+        self.elapsed = None
 
     def run(self, *args: Any, **kwargs: Any) -> None:
-        start = time.time()
+        start = time.monotonic()
+        deadline = start + self._timeout
+        poll = self._poll.start()
+        self.state = False
+        self.elapsed = None
+        while time.monotonic() < deadline:
+            # One tick per attempt, as in Wait
+            with tick():
+                if poll.ready(*args, **kwargs):
+                    self._trigger.run(*args, **kwargs)
+                    if not self._trigger.state:
+                        self.elapsed = time.monotonic() - start
+                        self.state = True
+                        break
+
+                    self._action.run(*args, **kwargs)
+
+            _sleep(poll.delay(), deadline)
+
+    async def arun(self, *args: Any, **kwargs: Any) -> None:
+        start = time.monotonic()
+        deadline = start + self._timeout
+        poll = self._poll.start()
         self.state = False
-        while time.time() - start < self._timeout:
-            self._trigger.run(*args, **kwargs)
-            if self._trigger.state:
-                self._action.run(*args, **kwargs)
-            else:
-                self.state = True
-                break
+        self.elapsed = None
+        while time.monotonic() < deadline:
+            with tick():
+                if await poll.aready(*args, **kwargs):
+                    await self._trigger.arun(*args, **kwargs)
+                    if not self._trigger.state:
+                        self.elapsed = time.monotonic() - start
+                        self.state = True
+                        break
+
+                    await self._action.arun(*args, **kwargs)
+
+            await _asleep(poll.delay(), deadline)
+
+    def close(self) -> None:
+        self._trigger.close()
+        self._action.close()
 
 
 class Print(WrapperNode):
     def __init__(self, *values: Any, **kwargs: Any):
         super().__init__(print, **kwargs)
         self._args_memory = values
+
+
+def _update_key(digest: Any, value: Any) -> None:
+    if hasattr(value, "__array_interface__") and hasattr(value, "tobytes"):
+        digest.update(repr(("array", value.shape, value.dtype.str)).encode())
+        digest.update(value.tobytes())
+    elif hasattr(value, "__array__"):
+        # Array wrappers such as gurun.cv.frame.Frame key by their pixels
+        _update_key(digest, value.__array__())
+    elif isinstance(value, (list, tuple)):
+        digest.update(repr((type(value).__name__, len(value))).encode())
+        for item in value:
+            _update_key(digest, item)
+    elif isinstance(value, dict):
+        digest.update(repr(("dict", len(value))).encode())
+        for name in sorted(value, key=repr):
+            _update_key(digest, name)
+            _update_key(digest, value[name])
+    elif value is None or isinstance(value, (str, bytes, int, float, bool)):
+        digest.update(repr((type(value).__name__, value)).encode())
+    else:
+        try:
+            digest.update(pickle.dumps(value, protocol=4))
+        except Exception:
+            raise TypeError(
+                f"CachedNode cannot build a key for {type(value).__name__}, "
+                "pass a key function instead"
+            )
+
+
+def _cache_key(args: tuple, kwargs: dict) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    _update_key(digest, args)
+    _update_key(digest, kwargs)
+    return digest.digest()
+
+
+class CachedNode(Node):
+    def __init__(
+        self,
+        node: Node,
+        max_size: int = 128,
+        ttl: float = None,
+        directory: str = None,
+        namespace: str = None,
+        key: Callable = None,
+        **kwargs: Any,
+    ):
+        super().__init__(**kwargs)
+        if max_size < 1:
+            raise ValueError("max_size must be a positive integer")
+
+        # Each namespace keeps its entries in a folder of its own, so nodes
+        # sharing a directory never read or invalidate each other's entries.
+        # Entries are unpickled when read, so the directory must only be
+        # writable by trusted code.
+        if directory is not None:
+            if namespace is None:
+                raise ValueError("CachedNode needs a namespace to use a directory")
+            if namespace in (".", "..") or os.path.basename(namespace) != namespace:
+                raise ValueError("CachedNode namespace must be a plain folder name")
+
+        self._node = node
+        self._max_size = max_size
+        self._ttl = ttl
+        self._directory = (
+            None if directory is None else os.path.join(directory, namespace)
+        )
+        self._namespace = namespace
+        self._key = key
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        if self._directory is not None:
+            os.makedirs(self._directory, exist_ok=True)
+
+    @property
+    def node(self) -> Node:
+        return self._node
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def namespace(self) -> str:
+        return self._namespace
+
+    def _make_key(self, args: tuple, kwargs: dict) -> bytes:
+        if self._key is not None:
+            args, kwargs = (self._key(*args, **kwargs),), {}
+
+        return _cache_key((self._namespace, args), kwargs)
+
+    def _path(self, key: bytes) -> str:
+        return os.path.join(self._directory, key.hex() + ".pkl")
+
+    def _expired(self, created: float) -> bool:
+        return self._ttl is not None and time.time() - created >= self._ttl
+
+    def _load(self, key: bytes) -> Tuple[Any, bool, float]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                entry = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+        return entry
+
+    def _remove(self, key: bytes) -> None:
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _store(self, key: bytes, entry: Tuple[Any, bool, float]) -> None:
+        path = self._path(key)
+        # Written next to the target and renamed, so readers in other
+        # processes never see a partial file.
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporary, "wb") as file:
+                pickle.dump(entry, file, protocol=4)
+            os.replace(temporary, path)
+        except Exception:
+            # Outputs that cannot be pickled stay in the memory tier only
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+    def _get(self, key: bytes) -> Tuple[bool, Any, bool]:
+        expired = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[2]):
+                del self._entries[key]
+                self.expirations += 1
+                expired = True
+                entry = None
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[0], entry[1]
+
+        if self._directory is not None:
+            entry = self._load(key)
+            if entry is not None and self._expired(entry[2]):
+                self._remove(key)
+                if not expired:
+                    # Counted once when the memory tier expired it as well
+                    with self._lock:
+                        self.expirations += 1
+                entry = None
+
+            if entry is not None:
+                with self._lock:
+                    self.hits += 1
+                    self._put(key, entry)
+                return True, entry[0], entry[1]
+
+        with self._lock:
+            self.misses += 1
+        return False, None, False
+
+    def _put(self, key: bytes, entry: Tuple[Any, bool, float]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _save(self, key: bytes, output: Any, state: bool) -> None:
+        entry = (output, state, time.time())
+        with self._lock:
+            self._put(key, entry)
+
+        if self._directory is not None:
+            self._store(key, entry)
+
+    def run(self, *args: Any, **kwargs: Any) -> Any:
+        key = self._make_key(args, kwargs)
+        hit, output, state = self._get(key)
+        if not hit:
+            output = self._node.run(*args, **kwargs)
+            state = self._node.state
+            self._save(key, output, state)
+
+        self.state = state
+        return output
+
+    async def arun(self, *args: Any, **kwargs: Any) -> Any:
+        key = self._make_key(args, kwargs)
+        hit, output, state = self._get(key)
+        if not hit:
+            output = await self._node.arun(*args, **kwargs)
+            state = self._node.state
+            self._save(key, output, state)
+
+        self.state = state
+        return output
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+        if self._directory is not None:
+            # Only files named after a key are removed, the folder may hold
+            # other files.
+            for name in os.listdir(self._directory):
+                if len(name) == 36 and name.endswith(".pkl"):
+                    try:
+                        os.remove(os.path.join(self._directory, name))
+                    except FileNotFoundError:
+                        # Another process invalidated it first
+                        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def close(self) -> None:
+        self._node.close()
@@ -0,0 +1,84 @@
+from gurun.compiler import CompiledNode, compile
+from gurun.node import (
+    BranchNode,
+    ConstantNode,
+    Node,
+    NodeSequence,
+    NullNode,
+    UnionNode,
+)
+
+
+def _failing(x: int) -> int:
+    raise Exception("Test")
+
+
+def test_compile_node_sequence():
+    node = NodeSequence([NullNode(), ConstantNode(default_output=10), lambda x: x + 1])
+    compiled = compile(node)
+
+    assert isinstance(compiled, CompiledNode)
+    assert compiled.name == "NodeSequence"
+    assert compiled.run(1) == node.run(1) == 11
+    assert compiled.state is True
+    assert compiled.output == 11
+
+
+def test_compile_node_sequence_with_exception():
+    node = NodeSequence([NullNode(), _failing, lambda x: x + 1])
+    compiled = compile(node)
+
+    assert compiled.run(1) is None
+    assert compiled.state is False
+    assert node.state is False
+
+
+def test_compile_union_node():
+    node = (
+        UnionNode()
+        .add_node(NullNode())
+        .add_node(lambda x: x + 1)
+        .add_node(lambda x: x + 2, "TestNode")
+    )
+
+    assert compile(node).run(1) == {"WrapperNode": 2, "TestNode": 3}
+
+    node.return_node_names = "WrapperNode"
+    assert compile(node).run(1) == 2
+
+    node.return_node_names = "Example"
+    assert compile(node).run(1) is None
+
+    assert compile(UnionNode([NullNode(), _failing])).run(1) is None
+
+
+def test_compile_branch_node():
+    node = BranchNode(lambda x: x, positive=lambda x: x + 1, negative=lambda x: x - 1)
+    compiled = compile(node)
+
+    assert compiled.run(0) == 1
+    assert node.positive.output == 1
+
+    node.trigger = ConstantNode(default_output=0, default_state=False)
+
+    assert compile(node).run() == -1
+    assert node.state is True
+
+
+def test_compile_nested_graph():
+    class Double(Node):
+        def run(self, x: int) -> dict:
+            return {"x": x * 2}
+
+    inner = NodeSequence([Double(ravel=True), lambda x: x + 1])
+    node = NodeSequence(
+        [
+            UnionNode([inner, lambda x: x], return_node_names="NodeSequence"),
+            BranchNode(lambda x: x, positive=lambda x: x * 10),
+        ]
+    )
+    compiled = compile(node)
+
+    assert compiled.run(2) == node.run(2) == 50
+    assert inner.output == 5
+    assert inner.state is True
@@ -0,0 +1,106 @@
+import pytest
+
+from gurun.context import current_tick, tick
+from gurun.node import Node, UnionNode
+from gurun.runner import Runner
+
+
+class TickRecorder(Node):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.ticks = []
+
+    def run(self, *args, **kwargs) -> None:
+        self.ticks.append(current_tick())
+
+
+def test_tick():
+    assert current_tick() is None
+
+    with tick() as outer:
+        assert current_tick() is outer
+        with tick() as inner:
+            assert current_tick() is inner
+            assert inner.index > outer.index
+        assert current_tick() is outer
+
+    assert current_tick() is None
+
+
+def test_parallel_union_node_shares_tick():
+    recorders = [TickRecorder(), TickRecorder()]
+    node = UnionNode(recorders, parallel=True)
+
+    with tick() as current:
+        node.run()
+
+    assert recorders[0].ticks == recorders[1].ticks == [current]
+
+
+def test_runner_ticks():
+    first, second = TickRecorder(), TickRecorder()
+    calls = []
+
+    class StopAfterTwoPasses(Node):
+        def run(self, *args, **kwargs) -> None:
+            calls.append(1)
+            if len(calls) == 2:
+                raise KeyboardInterrupt()
+
+    Runner([first, second, StopAfterTwoPasses()], interval=0).run()
+
+    # Every node runs in a tick of its own, so a frame bus captures again
+    # after each interval instead of handing later nodes a stale frame.
+    assert len(first.ticks) == len(second.ticks) == 2
+    assert None not in first.ticks + second.ticks
+    assert len({id(tick) for tick in first.ticks + second.ticks}) == 4
+    assert current_tick() is None
+
+
+def test_scheduled_runner_does_not_leak_tick():
+    from gurun.runner import ScheduledRunner
+
+    recorder = TickRecorder()
+
+    class Stop(Node):
+        def run(self, *args, **kwargs) -> None:
+            raise KeyboardInterrupt()
+
+    ScheduledRunner([(recorder, 0), (Stop(), 0.01)]).run()
+
+    assert recorder.ticks[0] is not None
+    assert current_tick() is None
+
+
+def test_wait_polls_in_fresh_ticks():
+    from gurun.utils import FixedPoll, Wait
+
+    class SucceedOnThird(TickRecorder):
+        def run(self, *args, **kwargs) -> None:
+            super().run()
+            self.state = len(self.ticks) == 3
+
+    node = SucceedOnThird()
+    with tick() as outer:
+        Wait(node, timeout=1, poll=FixedPoll(0)).run()
+        assert current_tick() is outer
+
+    assert len(set(node.ticks)) == 3
+    assert outer not in node.ticks
+
+
+def test_frame_bus_recaptures_inside_wait():
+    np = pytest.importorskip("numpy")
+    from gurun.cv.bus import FrameBus
+    from gurun.node import WrapperNode
+    from gurun.utils import FixedPoll, Wait
+
+    frames = iter(np.full((2, 2), value) for value in range(10))
+    bus = FrameBus(WrapperNode(lambda: next(frames)))
+    detector = WrapperNode(lambda: 1 if bus.run()[0, 0] == 3 else 1 / 0)
+
+    with tick():
+        bus.run()
+        assert Wait(detector, timeout=1, poll=FixedPoll(0)).run() == 1
+
+    assert bus.captures == 4
@@ -0,0 +1,130 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+
+from gurun.cv.detection import (
+    TemplateBank,
+    TemplateDetection,
+    TemplateDetectionFrom,
+    _local_maxima,
+    _non_max_suppression,
+)
+from gurun.cv.frame import Frame
+from gurun.node import WrapperNode
+
+
+def _frame(height=240, width=320, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    return cv2.GaussianBlur(frame, (5, 5), 0)
+
+
+def test_two_copies():
+    frame = _frame()
+    template = frame[40:70, 50:90].copy()
+    frame[150:180, 200:240] = template
+
+    rectangles = TemplateDetection(template, threshold=0.9).run(frame)
+
+    assert rectangles.dtype == np.int32
+    assert sorted(map(tuple, rectangles)) == [(50, 40, 40, 30), (200, 150, 40, 30)]
+
+
+def test_overlapping_hits_at_low_threshold():
+    frame = _frame()
+    template = frame[100:140, 100:140].copy()
+
+    # Pixels around the true match score above a low threshold too; they
+    # are merged into the single best rectangle.
+    node = TemplateDetection(template, threshold=0.3)
+    result = cv2.matchTemplate(frame, template, cv2.TM_CCOEFF_NORMED)
+    assert (result >= 0.3).sum() > 1
+
+    rectangles = node.run(frame)
+    assert tuple(rectangles[0]) == (100, 100, 40, 40)
+    for x, y, width, height in rectangles[1:]:
+        inter = max(width - abs(int(x) - 100), 0) * max(height - abs(int(y) - 100), 0)
+        assert inter <= 0.3 * (2 * width * height - inter)
+
+
+def test_plateau():
+    result = np.zeros((20, 20), np.float32)
+    result[5:10, 5:10] = 1.0
+
+    xloc, yloc, scores = _local_maxima(result, 0.5)
+
+    assert len(scores) == 1
+    assert (xloc[0], yloc[0]) == (5, 5)
+
+
+def test_non_max_suppression():
+    xloc = np.array([0, 2, 30])
+    yloc = np.array([0, 1, 30])
+    scores = np.array([0.8, 0.9, 0.7])
+
+    rectangles = _non_max_suppression(xloc, yloc, scores, 10, 10, 0.3)
+
+    np.testing.assert_array_equal(rectangles, [[2, 1, 10, 10], [30, 30, 10, 10]])
+
+
+def test_empty_result():
+    frame = _frame()
+    template = np.zeros((20, 20, 3), np.uint8)
+    template[:10] = 255
+    node = TemplateDetection(template, threshold=0.99)
+
+    empty = node._detect(frame)
+    assert empty.shape == (0, 4)
+    assert empty.dtype == np.int32
+
+    assert node.run(frame) is None
+    assert node.state is False
+
+    empty = _non_max_suppression(
+        *_local_maxima(np.zeros((5, 5), np.float32), 1), 3, 3, 0.3
+    )
+    assert empty.shape == (0, 4)
+    assert empty.dtype == np.int32
+
+
+def test_region_smaller_than_template():
+    frame = _frame()
+    template = frame[40:70, 50:90].copy()
+
+    with pytest.raises(ValueError):
+        TemplateDetection(template, region=(0, 0, 30, 100))
+    with pytest.raises(ValueError):
+        TemplateBank({"template": template}, region=(0, 0, 100, 20))
+
+    # Regions clipped by the frame border are caught at run time
+    detection = TemplateDetection(template, region=(300, 0, 100, 100))
+    with pytest.raises(ValueError):
+        detection.run(frame)
+
+
+def test_detection_from_screen_coordinates():
+    frame = _frame()
+    template = frame[40:70, 50:90].copy()
+    source = WrapperNode(lambda: Frame(frame, origin=(100, 50)))
+
+    detection = TemplateDetectionFrom(source, target=template, threshold=0.9)
+    assert tuple(detection.run()[0]) == (50, 40, 40, 30)
+
+    detection = TemplateDetectionFrom(
+        source, to_screen=True, target=template, threshold=0.9
+    )
+    assert tuple(detection.run()[0]) == (150, 90, 40, 30)
+
+
+def test_plateau_on_a_slope():
+    result = np.zeros((20, 20), np.float32)
+    # (4, 5) ties with the peak at (5, 5) but rises towards (3, 5)
+    result[5, 3:6] = [0.95, 0.9, 0.9]
+    # A V-shaped plateau is still a single peak
+    result[12, 10] = result[13, 11] = result[12, 12] = 0.8
+
+    xloc, yloc, scores = _local_maxima(result, 0.5)
+
+    assert list(zip(xloc, yloc)) == [(3, 5), (5, 5), (10, 12)]
+    np.testing.assert_allclose(scores, [0.95, 0.9, 0.8])
@@ -0,0 +1,32 @@
+import subprocess
+import sys
+
+import pytest
+
+import gurun
+
+
+def test_lazy_attributes():
+    from gurun.compiler import CompiledNode
+    from gurun.runner import Runner
+
+    assert gurun.CompiledNode is CompiledNode
+    assert gurun.runner.Runner is Runner
+    assert isinstance(gurun.version, str)
+    assert "runner" in dir(gurun)
+
+    with pytest.raises(AttributeError):
+        gurun.missing
+
+
+def test_import_is_light():
+    code = (
+        "import sys, gurun, gurun.cv, gurun.gui\n"
+        "heavy = {'cv2', 'numpy', 'mss', 'pyautogui'}\n"
+        "print(sorted(heavy & set(sys.modules)))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+
+    assert output.strip() == "[]"
@@ -0,0 +1,64 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+
+from gurun.cv.detection import TemplateDetection
+from gurun.cv.memo import FrameMemo, frame_digest
+
+
+def _frame(height=240, width=320, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    return cv2.GaussianBlur(frame, (5, 5), 0)
+
+
+def test_frame_digest():
+    frame = _frame()
+    changed = frame.copy()
+    changed[100, 100] ^= 1
+
+    assert frame_digest(frame) == frame_digest(frame.copy())
+    assert frame_digest(frame) != frame_digest(changed)
+    # Thumbnails trade exactness for speed: a single pixel rounds away
+    assert frame_digest(frame, exact=False) == frame_digest(changed, exact=False)
+
+
+def test_memo_limits():
+    memo = FrameMemo(max_hits=2)
+    memo.put(b"digest", 1)
+
+    assert memo.get(b"digest") == (True, 1)
+    assert memo.get(b"digest") == (True, 1)
+    assert memo.get(b"digest") == (False, None)
+    assert memo.get(b"other") == (False, None)
+    assert memo.stats() == {"hits": 2, "misses": 2}
+
+    memo = FrameMemo(max_age=0)
+    memo.put(b"digest", 1)
+    assert memo.get(b"digest") == (False, None)
+
+
+def test_memoized_detection():
+    frame = _frame()
+    template = frame[40:70, 50:90].copy()
+    detection = TemplateDetection(template, threshold=0.9, memoize=True)
+
+    first = detection.run(frame)
+    first[:] = 0
+    second = detection.run(frame.copy())
+
+    assert detection.memo.stats() == {"hits": 1, "misses": 1}
+    assert tuple(second[0]) == (50, 40, 40, 30)
+
+    frame[40:70, 50:90] = 0
+    assert detection.run(frame) is None
+
+
+def test_memo_cannot_be_shared():
+    frame = _frame()
+    memo = FrameMemo()
+    TemplateDetection(frame[40:70, 50:90].copy(), memoize=memo)
+
+    with pytest.raises(ValueError):
+        TemplateDetection(frame[100:130, 150:190].copy(), memoize=memo)
@@ -0,0 +1,85 @@
+import urllib.request
+
+import pytest
+
+from gurun.metrics import MetricsRegistry
+from gurun.node import ConstantNode, NodeSequence, WrapperNode
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry(buckets=(0.1, 1.0)).enable()
+    yield registry
+    registry.disable()
+
+
+def test_metrics(registry):
+    def fail():
+        raise Exception("Test")
+
+    node = NodeSequence(
+        [ConstantNode(1, name="One"), WrapperNode(lambda x: x + 1, name="Add")]
+    )
+    node.run()
+    node.run()
+    WrapperNode(fail, name="Fail").run()
+
+    snapshot = registry.snapshot()
+
+    assert snapshot["One"]["calls"] == 2
+    assert snapshot["Add"]["successes"] == 2
+    assert snapshot["NodeSequence"]["calls"] == 2
+    assert snapshot["Fail"]["failures"] == 1
+    assert snapshot["One"]["latency_buckets"][float("inf")] == 2
+
+
+def test_metrics_disabled():
+    registry = MetricsRegistry().enable()
+    registry.disable()
+
+    ConstantNode(1).run()
+
+    assert registry.snapshot() == {}
+
+
+def test_metrics_prometheus(registry, tmp_path):
+    ConstantNode(1, name='Quoted "node"').run()
+
+    text = registry.to_prometheus()
+
+    assert 'gurun_node_calls_total{node="Quoted \\"node\\""} 1' in text
+    assert "# TYPE gurun_node_latency_seconds histogram" in text
+    assert 'le="+Inf"} 1' in text
+
+    path = tmp_path / "metrics.prom"
+    registry.write_prometheus(str(path))
+    assert path.read_text() == text
+
+    server = registry.serve(port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url) as response:
+            assert "gurun_node_calls_total" in response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_metrics_compiled(registry):
+    from gurun.compiler import compile
+
+    node = compile(
+        NodeSequence(
+            [
+                NodeSequence([ConstantNode(1, name="c")], name="inner"),
+                NodeSequence([WrapperNode(lambda x: x + 1, name="Add")], name="u"),
+            ],
+            name="outer",
+        )
+    )
+
+    assert node.run() == 2
+
+    snapshot = registry.snapshot()
+    assert sorted(snapshot) == ["Add", "c", "inner", "outer", "u"]
+    assert all(metrics["calls"] == 1 for metrics in snapshot.values())
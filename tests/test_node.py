@@ -1,5 +1,9 @@
+import asyncio
+import threading
+
 import pytest
 
+from gurun.exceptions import GurunTypeError
 from gurun.node import (
     BranchNode,
     ConstantNode,
@@ -181,3 +185,210 @@ def test_branch_node_with_wrappers():
     node.trigger = ConstantNode(default_output=0, default_state=False)
 
     assert node.run() == -1
+
+
+def test_node_set_close():
+    closed = []
+
+    class ClosingNode(NullNode):
+        def close(self) -> None:
+            closed.append(self.name)
+
+    with NodeSet([ClosingNode(name="A"), ClosingNode(name="B")]) as node:
+        node.run()
+
+    assert closed == ["A", "B"]
+
+
+def test_node_memory():
+    class Add(Node):
+        def run(self, x: int, y: int = 0) -> int:
+            return x + y
+
+    node = Add(y=2)
+    node._args_memory = (1,)
+
+    assert node.run() == 3
+    assert node.output == 3
+
+
+def test_node_super_run():
+    class Base(Node):
+        def run(self, *args, **kwargs):
+            return args, kwargs
+
+    class Child(Base):
+        def run(self, *args, **kwargs):
+            return super().run(*args, **kwargs)
+
+    node = Child(key="value")
+    node._args_memory = (1,)
+
+    assert node.run(2) == ((1, 2), {"key": "value"})
+    assert node.output == ((1, 2), {"key": "value"})
+
+
+def test_parallel_union_node():
+    # Both children must be waiting at once for the barrier to open, which
+    # only happens when they run concurrently.
+    barrier = threading.Barrier(2, timeout=5)
+
+    def overlap(x: int) -> int:
+        barrier.wait()
+        return x + 1
+
+    node = UnionNode(parallel=True).add_node(overlap, "A").add_node(overlap, "B")
+    node.add_node(NullNode())
+
+    assert node.run(1) == {"A": 2, "B": 2}
+    assert list(node.run(1)) == ["A", "B"]
+
+    node.return_node_names = "B"
+    assert node.run(1) == 2
+
+
+def test_parallel_union_node_with_exception():
+    def f(x: int) -> int:
+        raise Exception("Test")
+
+    node = UnionNode([NullNode(), f, lambda x: x], parallel=True)
+
+    assert node.run(1) is None
+    assert node.state is False
+
+
+def test_node_arun():
+    async def add(x: int) -> int:
+        return x + 2
+
+    node = NodeSequence(
+        [
+            NullNode(),
+            ConstantNode(default_output=10),
+            lambda x: x + 1,
+            add,
+            BranchNode(lambda x: x, positive=lambda x: x * 2),
+        ]
+    )
+
+    assert asyncio.run(node.arun(1)) == 26
+    assert node.output == 26
+    assert node.state is True
+
+
+def test_union_node_arun():
+    node = UnionNode([NullNode(), lambda x: x + 1], parallel=True)
+    node.add_node(lambda x: x + 2, "TestNode")
+
+    assert asyncio.run(node.arun(1)) == {"WrapperNode": 2, "TestNode": 3}
+
+    node.add_node(lambda x: 1 / 0)
+
+    assert asyncio.run(node.arun(1)) is None
+    assert node.state is False
+
+
+def test_compact_nodes():
+    for node in [
+        Node(),
+        ConstantNode(1),
+        WrapperNode(len),
+        NodeSequence([NullNode()]),
+        UnionNode([NullNode()]),
+        BranchNode(NullNode()),
+    ]:
+        assert not hasattr(node, "__dict__")
+
+    assert Node()._memory is Node()._memory
+    with pytest.raises(TypeError):
+        Node()._memory["x"] = 1
+    assert Node(x=1)._memory == {"x": 1}
+
+    with pytest.raises(GurunTypeError):
+        Node(default_state=1)
+
+    class Custom(Node):
+        def run(self, *args, **kwargs):
+            self.extra = 1
+
+    node = Custom()
+    node.run()
+    assert node.extra == 1
+
+
+class Positive(Node):
+    def run(self, x):
+        self.state = x > 0
+        return x
+
+
+class Inverse(Node):
+    def run(self, x):
+        return 1 / x
+
+
+def test_node_sequence_stream():
+    node = NodeSequence([lambda x: x - 2, Positive(), lambda x: {"x": x}])
+    node.nodes[2].ravel = True
+    node.add_node(lambda x: x * 10)
+
+    for parallel in (False, True):
+        outputs, states = [], []
+        for output in node.stream(range(5), parallel=parallel, max_in_flight=2):
+            outputs.append(output)
+            states.append(node.state)
+
+        assert outputs == [-2, -1, 0, 10, 20]
+        assert states == [False, False, False, True, True]
+        assert node.output == 20
+
+    node = NodeSequence([lambda x: x, lambda x: None, lambda: 1])
+    assert list(node.stream(range(3))) == [1, 1, 1]
+    assert list(node.stream(range(3), parallel=True)) == [1, 1, 1]
+
+    union = UnionNode([lambda x: x])
+    union.add_node(lambda x: x + 1, "Next")
+    assert list(union.stream([1, 2])) == [
+        {"WrapperNode": 1, "Next": 2},
+        {"WrapperNode": 2, "Next": 3},
+    ]
+
+    for options in ({"parallel": True}, {"parallel": False}, {"max_in_flight": 1}):
+        assert list(union.stream([1, 2], **options)) == [
+            {"WrapperNode": 1, "Next": 2},
+            {"WrapperNode": 2, "Next": 3},
+        ]
+        assert union.state is True
+        assert union.output == {"WrapperNode": 2, "Next": 3}
+
+    single = UnionNode([lambda x: x + 1])
+    assert list(single.stream([1, 2], parallel=True)) == [
+        {"WrapperNode": 2},
+        {"WrapperNode": 3},
+    ]
+    with pytest.raises(ValueError):
+        union.stream([1], max_in_flight=0)
+
+
+def test_node_sequence_stream_parallel():
+    threads = set()
+
+    def record(x):
+        threads.add(threading.current_thread().name)
+        return x
+
+    node = NodeSequence([record, lambda x: x])
+    assert list(node.stream(range(3), parallel=True)) == [0, 1, 2]
+    assert threads == {"gurun-WrapperNode"}
+
+    stream = NodeSequence([lambda x: x, Inverse()]).stream(range(-2, 3), parallel=True)
+    assert next(stream) == -0.5
+    assert next(stream) == -1
+    with pytest.raises(ZeroDivisionError):
+        next(stream)
+
+    # Leaving a stream early stops its threads
+    stream = NodeSequence([lambda x: x, lambda x: x]).stream(range(1000), parallel=True)
+    assert next(stream) == 0
+    stream.close()
+    assert not any(t.name == "gurun-stream" for t in threading.enumerate())
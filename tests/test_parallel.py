@@ -0,0 +1,44 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+
+from multiprocessing import shared_memory
+
+from gurun.cv.frame import Frame
+from gurun.cv.parallel import ProcessTemplateBank
+
+
+def test_process_template_bank():
+    rng = np.random.default_rng(0)
+    frame = cv2.GaussianBlur(
+        rng.integers(0, 256, (240, 320, 3), dtype=np.uint8), (5, 5), 0
+    )
+    templates = {"a": frame[40:70, 50:90].copy(), "b": frame[150:180, 200:240].copy()}
+    expected = {"a": [[50, 40, 40, 30]], "b": [[200, 150, 40, 30]]}
+
+    bank = ProcessTemplateBank(templates, threshold=0.9, processes=2)
+    names = []
+    try:
+        # Larger frames reallocate the shared buffer, smaller ones reuse it
+        for height, width in ((240, 320), (480, 640), (200, 260), (480, 640)):
+            image = np.zeros((height, width, 3), np.uint8)
+            image[:200, :260] = frame[:200, :260]
+
+            found = bank.run(Frame(image))
+            assert found.keys() == expected.keys()
+            for name, rectangles in found.items():
+                np.testing.assert_array_equal(rectangles, expected[name])
+
+            names.append(bank._shm.name)
+
+        assert bank.run(frame[:100, :100]) is None
+        assert bank.state is False
+    finally:
+        bank.close()
+
+    assert names[0] != names[1] and names[1] == names[2] == names[3]
+    assert bank._shm is None
+    for name in set(names):
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
@@ -1,8 +1,24 @@
-from gurun.node import ConstantNode, NullNode
-from gurun.runner import Runner
+import pytest
+
+from gurun import runner as runner_module
+from gurun.node import ConstantNode, Node, NullNode
+from gurun.runner import AsyncRunner, Runner, ScheduledRunner
 from gurun.utils import RaiseException
 
 
+class Counter(Node):
+    def __init__(self, limit: int = None, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.count = 0
+        self._limit = limit
+
+    def run(self, *args, **kwargs) -> int:
+        self.count += 1
+        if self.count == self._limit:
+            raise KeyboardInterrupt()
+        return self.count
+
+
 def test_runner():
     runner = Runner(
         [
@@ -21,3 +37,56 @@ def test_runner():
     assert runner.nodes[2].output is None
 
     assert len(runner.nodes) == 4
+
+
+def test_async_runner():
+    runners = [
+        Runner([ConstantNode(1), RaiseException(KeyboardInterrupt())], interval=0),
+        Runner([NullNode(), RaiseException(KeyboardInterrupt())], interval=0),
+    ]
+
+    AsyncRunner(runners).run()
+
+    assert runners[0].nodes[0].output == 1
+    assert runners[1].nodes[0].output is None
+
+
+def test_scheduled_runner(clock, monkeypatch):
+    monkeypatch.setattr(runner_module, "time", clock)
+    fast = Counter(name="Fast")
+    slow = Counter(name="Slow", limit=4)
+    runner = ScheduledRunner([(fast, 0.25), (slow, 1)], interval=1)
+
+    runner.run()
+
+    # Slow stops on its fourth run at t=3, after Fast ran at every quarter
+    assert clock.now == 3
+    assert fast.count == 13
+    assert slow.count == 4
+
+    stats = {stat["name"]: stat for stat in runner.stats}
+    assert stats["Slow"]["runs"] == 4
+    assert stats["Fast"]["interval"] == 0.25
+    assert stats["Fast"]["max_drift"] == 0
+    assert stats["Fast"]["missed"] == 0
+
+
+def test_scheduled_runner_skips_missed_deadlines(clock, monkeypatch):
+    monkeypatch.setattr(runner_module, "time", clock)
+
+    class Busy(Counter):
+        def run(self, *args, **kwargs) -> int:
+            clock.sleep(0.6)
+            return super().run(*args, **kwargs)
+
+    fast = Counter(name="Fast")
+    busy = Busy(name="Busy", limit=2)
+    runner = ScheduledRunner([(fast, 0.25), (busy, 1)])
+
+    runner.run()
+
+    # Fast runs late at 0.6, skips the deadline at 0.5 and keeps its phase
+    assert fast.count == 4
+    stats = {stat["name"]: stat for stat in runner.stats}
+    assert stats["Fast"]["missed"] == 1
+    assert stats["Fast"]["max_drift"] == pytest.approx(0.35)
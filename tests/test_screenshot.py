@@ -0,0 +1,118 @@
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+
+from gurun.cv.frame import Frame
+from gurun.gui import screenshot
+from gurun.gui.screenshot import ScreenshotMMS
+
+MONITORS = [
+    {"left": 0, "top": 0, "width": 200, "height": 100},
+    {"left": 100, "top": 50, "width": 8, "height": 6},
+]
+
+
+class FakeShot:
+    def __init__(self, area):
+        self.width = area["width"]
+        self.height = area["height"]
+        pixels = np.arange(self.width * self.height * 4) % 251
+        self.raw = bytearray(pixels.astype(np.uint8).tobytes())
+
+
+class FakeMSS:
+    instances = []
+
+    def __init__(self):
+        self.monitors = [dict(monitor) for monitor in MONITORS]
+        self.thread = threading.get_ident()
+        self.closed = False
+        self.shots = []
+        FakeMSS.instances.append(self)
+
+    def grab(self, area):
+        assert threading.get_ident() == self.thread
+        self.shots.append(FakeShot(area))
+        return self.shots[-1]
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class FakeModule:
+    mss = FakeMSS
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    FakeMSS.instances = []
+    monkeypatch.setattr(screenshot, "load_mss", lambda: FakeModule)
+    return FakeMSS.instances
+
+
+def test_zero_copy_view(sessions):
+    node = ScreenshotMMS(monitor=1)
+
+    first = node.run()
+    second = node.run()
+
+    assert len(sessions) == 1
+    assert first.shape == (6, 8, 3)
+    assert first.dtype == np.uint8
+    shot = sessions[0].shots[0]
+    raw = np.frombuffer(shot.raw, dtype=np.uint8).reshape(6, 8, 4)
+    assert np.shares_memory(first, raw)
+    np.testing.assert_array_equal(first, raw[:, :, :3])
+    assert not np.shares_memory(first, second)
+
+    node.close()
+    assert sessions[0].closed
+
+
+def test_out_and_frame(sessions):
+    node = ScreenshotMMS(monitor=1, region=(2, 1, 4, 3), frame=True)
+    out = np.empty((3, 4, 3), dtype=np.uint8)
+
+    frame = node.run(out=out)
+
+    assert isinstance(frame, Frame)
+    assert frame.origin == (102, 51)
+    assert np.shares_memory(frame.image, out)
+    np.testing.assert_array_equal(out, node.run().image)
+    node.close()
+
+
+def test_origin_does_not_keep_a_session(sessions):
+    node = ScreenshotMMS(monitor=1, region=(2, 1, 4, 3))
+
+    assert node.origin == (102, 51)
+    assert node.area["width"] == 4
+    assert len(sessions) == 1
+    assert sessions[0].closed
+
+
+def test_session_per_thread(sessions):
+    node = ScreenshotMMS(monitor=1)
+    node.run()
+    thread = threading.Thread(target=node.run)
+    thread.start()
+    thread.join()
+
+    assert len(sessions) == 2
+    assert sessions[0].thread != sessions[1].thread
+
+    node.close()
+    assert all(sct.closed for sct in sessions)
+
+    node.run()
+    assert len(sessions) == 3
+    node.close()
@@ -0,0 +1,137 @@
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+
+from gurun.cv.frame import Frame
+from gurun.cv.sources import FrameSource, ImageDirectorySource, NpySource, VideoSource
+
+FRAMES = np.arange(5 * 4 * 6 * 3, dtype=np.uint8).reshape(5, 4, 6, 3)
+
+
+@pytest.fixture
+def npy(tmp_path):
+    path = tmp_path / "frames.npy"
+    np.save(path, FRAMES)
+    return str(path)
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_npy_source(npy, prefetch):
+    source = NpySource(npy, prefetch=prefetch)
+
+    frames = list(source)
+    assert len(frames) == len(source) == 5
+    np.testing.assert_array_equal(np.stack(frames), FRAMES)
+    assert source.index == 5
+
+    assert source.run() is None
+    assert source.state is False
+
+    source.reset()
+    assert source.index == 0
+    np.testing.assert_array_equal(source.run(), FRAMES[0])
+    source.close()
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_loop_and_frames(npy, prefetch):
+    source = NpySource(npy, prefetch=prefetch, loop=True, frame=True)
+
+    frames = [source.run() for _ in range(12)]
+    assert all(isinstance(frame, Frame) for frame in frames)
+    np.testing.assert_array_equal(frames[10].image, FRAMES[0])
+    source.close()
+
+
+def test_npy_prefetch_reads_ahead(npy):
+    source = NpySource(npy, prefetch=2)
+
+    frames = list(source)
+
+    assert not any(isinstance(frame, np.memmap) for frame in frames)
+    assert all(frame.flags.owndata for frame in frames)
+    np.testing.assert_array_equal(np.stack(frames), FRAMES)
+    assert isinstance(NpySource(npy).run(), np.memmap)
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = str(tmp_path / "frames.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (32, 24))
+    if not writer.isOpened():
+        pytest.skip("No video encoder available")
+
+    for value in (0, 120, 240):
+        writer.write(np.full((24, 32, 3), value, dtype=np.uint8))
+    writer.release()
+
+    return path
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_video_source(video, prefetch):
+    source = VideoSource(video, prefetch=prefetch)
+
+    frames = list(source)
+    assert [frame.shape for frame in frames] == [(24, 32, 3)] * 3
+    # Compression is lossy, so only the order of the frames is checked
+    assert [int(frame.mean() // 60) for frame in frames] == [0, 2, 4]
+    assert source.run() is None
+    source.close()
+
+    source = VideoSource(video, prefetch=prefetch, loop=True)
+    assert len([source.run() for _ in range(7)]) == 7
+    assert source.state is True
+    assert source.index == 7
+    source.close()
+
+    with pytest.raises(ValueError):
+        VideoSource(video + ".missing")
+
+
+def test_early_close(npy):
+    source = NpySource(npy, prefetch=1)
+    source.run()
+    source.close()
+
+    assert not any(thread.name == "gurun-NpySource" for thread in threading.enumerate())
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_image_directory_source(tmp_path, prefetch):
+    for index in (10, 2, 1):
+        cv2.imwrite(str(tmp_path / f"frame_{index}.png"), FRAMES[index % 5])
+
+    source = ImageDirectorySource(str(tmp_path), prefetch=prefetch)
+
+    assert [path.rsplit("/", 1)[1] for path in source.files] == [
+        "frame_1.png",
+        "frame_2.png",
+        "frame_10.png",
+    ]
+    frames = list(source)
+    np.testing.assert_array_equal(frames[1], FRAMES[2])
+    np.testing.assert_array_equal(frames[2], FRAMES[0])
+    source.close()
+
+
+class Broken(FrameSource):
+    def _frames(self):
+        yield FRAMES[0]
+        raise RuntimeError("Broken reader")
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_reader_error(prefetch):
+    source = Broken(prefetch=prefetch)
+
+    np.testing.assert_array_equal(source.run(), FRAMES[0])
+    with pytest.raises(RuntimeError):
+        source.run()
+
+    assert source.run() is None
+    assert source.state is False
+    source.close()
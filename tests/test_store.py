@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+
+from gurun.cv import store
+from gurun.cv.detection import TemplateDetection
+from gurun.cv.store import TemplateStore
+
+
+def write(path, value, shape=(4, 4, 3)):
+    cv2.imwrite(str(path), np.full(shape, value, dtype=np.uint8))
+    return str(path)
+
+
+def test_store_hits_and_read_only(tmp_path):
+    store = TemplateStore()
+    path = write(tmp_path / "a.png", 10)
+
+    first = store.get(path)
+    second = store.get(path)
+
+    assert first is second
+    assert store.stats()["hits"] == 1
+    assert store.stats()["misses"] == 1
+    with pytest.raises(ValueError):
+        first[0, 0, 0] = 0
+
+    assert store.get(str(tmp_path / "missing.png")) is None
+
+
+def test_store_reloads_changed_files(tmp_path):
+    store = TemplateStore()
+    path = write(tmp_path / "a.png", 10)
+    stat = os.stat(path)
+    assert store.get(path)[0, 0, 0] == 10
+
+    # A rewrite with the same mtime is still caught through the size
+    write(path, 20, shape=(8, 8, 3))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert store.get(path)[0, 0, 0] == 20
+
+    write(path, 30, shape=(8, 8, 3))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert store.get(path)[0, 0, 0] == 30
+    assert len(store) == 1
+
+
+def test_store_evicts_least_recently_used(tmp_path):
+    paths = [write(tmp_path / f"{index}.png", index) for index in range(3)]
+    store = TemplateStore(max_bytes=2 * 4 * 4 * 3)
+
+    store.get(paths[0])
+    store.get(paths[1])
+    store.get(paths[0])
+    store.get(paths[2])
+
+    assert paths[0] in store
+    assert paths[1] not in store
+    assert paths[2] in store
+    assert store.nbytes == 2 * 4 * 4 * 3
+    assert store.evictions == 1
+
+    store.max_bytes = 0
+    assert len(store) == 1 and paths[2] in store
+
+
+def test_detection_reads_image_paths_through_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "template_store", TemplateStore())
+    rng = np.random.default_rng(0)
+    image = cv2.GaussianBlur(
+        rng.integers(0, 256, (60, 80, 3), dtype=np.uint8), (5, 5), 0
+    )
+    path = str(tmp_path / "frame.png")
+    cv2.imwrite(path, image)
+    detection = TemplateDetection(image[10:30, 20:50].copy(), threshold=0.9)
+
+    assert tuple(detection.run(path)[0]) == (20, 10, 30, 20)
+    assert tuple(detection.run(path)[0]) == (20, 10, 30, 20)
+    assert store.template_store.stats()["hits"] == 1
@@ -0,0 +1,75 @@
+import json
+
+from gurun.node import BranchNode, ConstantNode, NodeSequence, UnionNode
+from gurun.tracing import Tracer
+
+
+def test_tracer(tmp_path):
+    node = NodeSequence(
+        [
+            UnionNode([ConstantNode([1, 2], name="List"), ConstantNode(None)]),
+            BranchNode(lambda x: x, positive=lambda x: x),
+        ]
+    )
+
+    with Tracer() as tracer:
+        node.run()
+
+    events = {event["name"]: event for event in tracer.events}
+
+    assert len(tracer.events) == 7
+    assert events["NodeSequence"]["args"]["parent_id"] is None
+    assert (
+        events["UnionNode"]["args"]["parent_id"]
+        == events["NodeSequence"]["args"]["span_id"]
+    )
+    assert events["List"]["args"]["parent_id"] == events["UnionNode"]["args"]["span_id"]
+    assert events["List"]["args"]["output_size"] == 2
+    assert events["BranchNode"]["args"]["state"] is True
+    assert all(event["ph"] == "X" for event in tracer.events)
+
+    path = tmp_path / "trace.json"
+    tracer.export(str(path))
+    assert json.loads(path.read_text())["traceEvents"] == tracer.events
+
+    node.run()
+    assert len(tracer.events) == 7
+
+
+def test_tracer_bounded_and_sampled():
+    with Tracer(max_events=3) as tracer:
+        for _ in range(10):
+            ConstantNode(1).run()
+
+    assert len(tracer.events) == 3
+
+    with Tracer(sample_rate=0) as tracer:
+        NodeSequence([ConstantNode(1)]).run()
+
+    assert tracer.events == []
+
+
+def test_tracer_compiled():
+    from gurun.compiler import compile
+
+    node = compile(
+        NodeSequence(
+            [
+                NodeSequence([ConstantNode(1, name="c")], name="inner"),
+                UnionNode([lambda x: x], name="u"),
+            ],
+            name="outer",
+        )
+    )
+
+    with Tracer() as tracer:
+        node.run()
+
+    events = {event["name"]: event["args"] for event in tracer.events}
+
+    assert sorted(events) == ["WrapperNode", "c", "inner", "outer", "u"]
+    assert events["outer"]["parent_id"] is None
+    assert events["inner"]["parent_id"] == events["outer"]["span_id"]
+    assert events["c"]["parent_id"] == events["inner"]["span_id"]
+    assert events["u"]["parent_id"] == events["outer"]["span_id"]
+    assert events["WrapperNode"]["parent_id"] == events["u"]["span_id"]
@@ -0,0 +1,66 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+
+from gurun.cv.frame import Frame
+from gurun.cv.transformation import (
+    NaturalRectToPoint,
+    Offset,
+    RectToPoint,
+    TransformationChain,
+)
+
+RECTANGLES = np.array([[10, 20, 4, 6], [0, 0, 10, 10]], dtype=np.int32)
+
+
+def test_rect_to_point():
+    node = RectToPoint()
+
+    points = node.run(RECTANGLES)
+    assert isinstance(points, np.ndarray)
+    np.testing.assert_array_equal(points, [[12, 23], [5, 5]])
+
+    assert node.run(RECTANGLES[0]) == {"x": 12, "y": 23}
+    assert node.run(None) is None
+    assert node.state is False
+
+    with pytest.raises(ValueError):
+        node.run(np.zeros((1, 1, 1)))
+
+
+def test_natural_rect_to_point():
+    points = NaturalRectToPoint(seed=0).run(RECTANGLES)
+
+    assert points.dtype == np.int64
+    assert np.all(points >= RECTANGLES[:, :2] + RECTANGLES[:, 2:] * 0.25 - 1)
+    assert np.all(points < RECTANGLES[:, :2] + RECTANGLES[:, 2:] * 0.75)
+    np.testing.assert_array_equal(points, NaturalRectToPoint(seed=0).run(RECTANGLES))
+
+
+def test_offset():
+    rectangles = RECTANGLES.copy()
+    shifted = Offset(1, 2).run(rectangles)
+
+    np.testing.assert_array_equal(shifted, [[11, 22, 4, 6], [1, 2, 10, 10]])
+    np.testing.assert_array_equal(rectangles, RECTANGLES)
+
+    assert Offset(1, 2).run({"x": 1, "y": 2}) == {"x": 2, "y": 4}
+    assert Offset(0.5, 0.5).run({"x": 10, "y": 20}) == {"x": 10.5, "y": 20.5}
+
+
+def test_out_and_frame():
+    out = np.empty((2, 2))
+    assert RectToPoint().run(RECTANGLES, out=out) is out
+    np.testing.assert_array_equal(out, [[12, 23], [5, 5]])
+
+    frame = Frame(np.zeros((4, 4), np.uint8), origin=(100, 200))
+    assert RectToPoint().run(RECTANGLES[0], frame=frame) == {"x": 112, "y": 223}
+
+
+def test_transformation_chain():
+    chain = TransformationChain([RectToPoint(), Offset(5, 5)])
+
+    np.testing.assert_array_equal(chain.run(RECTANGLES), [[17, 28], [10, 10]])
+    assert chain.run(RECTANGLES[1]) == {"x": 10, "y": 10}
+    assert len(chain.transformations) == 2
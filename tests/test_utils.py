@@ -1,9 +1,23 @@
+import asyncio
+import os
 import time
 
+import pytest
+
+from gurun import utils
+from gurun.node import ConstantNode, WrapperNode
+from gurun.utils import (
+    BackoffPoll,
+    CachedNode,
+    ChangePoll,
+    FixedPoll,
+    Sleep,
+    Wait,
+    While,
+)
 
-def test_sleep():
-    from gurun.utils import Sleep
 
+def test_sleep():
     expected = 0.5
 
     node = Sleep(expected, verbose=3)
@@ -13,3 +27,209 @@ def test_sleep():
     end_time = time.time()
 
     assert end_time - start_time >= expected
+
+
+def test_sleep_arun():
+    async def sleep_twice():
+        await asyncio.gather(Sleep(0.3).arun(), Sleep(0.3).arun())
+
+    start_time = time.time()
+    asyncio.run(sleep_twice())
+    end_time = time.time()
+
+    assert 0.3 <= end_time - start_time < 0.55
+
+
+class _Counter:
+    def __init__(self, succeed_at: int = None) -> None:
+        self.calls = 0
+        self._succeed_at = succeed_at
+
+    def __call__(self, *args, **kwargs) -> int:
+        self.calls += 1
+        if self.calls != self._succeed_at:
+            raise Exception("Not yet")
+        return self.calls
+
+
+def test_wait_fixed_poll(clock, monkeypatch):
+    monkeypatch.setattr(utils, "time", clock)
+    counter = _Counter()
+    node = Wait(WrapperNode(counter), timeout=0.5, poll=FixedPoll(0.125))
+
+    assert node.run() is None
+    assert node.state is False
+    assert node.elapsed is None
+    assert counter.calls == 4
+    assert clock.now == 0.5
+
+
+def test_wait_backoff_poll(clock, monkeypatch):
+    monkeypatch.setattr(utils, "time", clock)
+    counter = _Counter(succeed_at=4)
+    node = Wait(
+        WrapperNode(counter),
+        timeout=2,
+        poll=BackoffPoll(initial=0.125, factor=2, maximum=0.25),
+    )
+
+    assert node.run() == 4
+    assert node.state is True
+    # Delays of 0.125, 0.25 and the 0.25 maximum between the four attempts
+    assert node.elapsed == 0.625
+
+
+def test_wait_change_poll(clock, monkeypatch):
+    monkeypatch.setattr(utils, "time", clock)
+    counter = _Counter()
+    node = Wait(
+        WrapperNode(counter),
+        timeout=0.3,
+        poll=ChangePoll(ConstantNode(default_output="frame"), interval=0.01),
+    )
+
+    assert node.run() is None
+    assert counter.calls == 1
+
+
+def test_change_poll_compares_frame_pixels():
+    np = pytest.importorskip("numpy")
+    pytest.importorskip("cv2")
+    from gurun.cv.frame import Frame
+
+    image = np.zeros((4, 4, 3), dtype=np.uint8)
+    poll = ChangePoll(WrapperNode(lambda: Frame(image))).start()
+
+    assert poll.ready() is True
+    assert poll.ready() is False
+    image[0, 0] = 1
+    assert poll.ready() is True
+
+
+def test_poll_state_per_run():
+    poll = BackoffPoll(initial=0.01, factor=2, maximum=1)
+    first, second = poll.start(), poll.start()
+    assert [first.delay(), first.delay()] == [0.01, 0.02]
+    assert second.delay() == 0.01
+
+    # Two waits sharing a change poll both see the first probe as a change
+    poll = ChangePoll(ConstantNode(default_output="frame"), interval=0.01)
+    counters = [_Counter(), _Counter()]
+    for counter in counters:
+        Wait(WrapperNode(counter), timeout=0.05, poll=poll).run()
+
+    assert [counter.calls for counter in counters] == [1, 1]
+
+
+def test_while_poll(clock, monkeypatch):
+    monkeypatch.setattr(utils, "time", clock)
+    counter = _Counter()
+    trigger = WrapperNode(lambda: None if counter.calls < 3 else 1 / 0)
+    node = While(trigger, WrapperNode(counter), timeout=2, poll=FixedPoll(0.125))
+
+    node.run()
+
+    assert node.state is True
+    assert counter.calls == 3
+    assert node.elapsed == 0.375
+
+
+class _Square:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, value):
+        self.calls += 1
+        if value is None:
+            raise Exception("No value")
+        return value * value
+
+
+def test_cached_node():
+    np = pytest.importorskip("numpy")
+
+    square = _Square()
+    node = CachedNode(WrapperNode(square), max_size=2)
+
+    assert node.run(3) == 9
+    assert node.run(3) == 9
+    assert node.state is True
+    assert square.calls == 1
+
+    # Failed runs are cached together with their state
+    assert node.run(None) is None
+    assert node.state is False
+    assert node.run(None) is None
+    assert node.state is False
+    assert square.calls == 2
+
+    assert node.run(4) == 16
+    assert node.stats()["evictions"] == 1
+    assert node.run(3) == 9
+    assert square.calls == 4
+
+    # Arrays are keyed by content, shape and dtype
+    array = np.arange(4)
+    node.run(array)
+    node.run(array.copy())
+    node.run(array.reshape(2, 2))
+    assert square.calls == 6
+
+    assert node.hits == 3
+    assert node.misses == 6
+    assert node.hit_rate == 1 / 3
+
+
+def test_cached_node_ttl_and_disk(tmp_path):
+    square = _Square()
+    node = CachedNode(
+        WrapperNode(square), ttl=0.05, directory=str(tmp_path), namespace="square"
+    )
+
+    assert node.run(2) == 4
+    time.sleep(0.06)
+    assert node.run(2) == 4
+    assert node.stats()["expirations"] == 1
+    assert square.calls == 2
+
+    # A new node sharing the directory reads the disk tier
+    other = CachedNode(WrapperNode(square), directory=str(tmp_path), namespace="square")
+    assert asyncio.run(other.arun(2)) == 4
+    assert other.state is True
+    assert other.hits == 1
+    assert square.calls == 2
+
+    other.invalidate()
+    assert other.run(2) == 4
+    assert square.calls == 3
+
+    # Nodes in other namespaces never read each other's entries
+    double = CachedNode(
+        WrapperNode(lambda x: x * 2), directory=str(tmp_path), namespace="double"
+    )
+    shift = CachedNode(
+        WrapperNode(lambda x: x + 100), directory=str(tmp_path), namespace="shift"
+    )
+    assert double.run(3) == 6
+    assert shift.run(3) == 103
+
+    # Invalidating one namespace leaves the others on disk
+    double.invalidate()
+    assert os.listdir(tmp_path / "double") == []
+    assert len(os.listdir(tmp_path / "shift")) == 1
+
+    # Expired disk entries are counted too
+    expired = CachedNode(
+        WrapperNode(lambda x: x + 100),
+        ttl=0.05,
+        directory=str(tmp_path),
+        namespace="shift",
+    )
+    time.sleep(0.06)
+    assert expired.run(3) == 103
+    assert expired.stats()["expirations"] == 1
+
+    with pytest.raises(ValueError):
+        CachedNode(WrapperNode(square), directory=str(tmp_path))
+    with pytest.raises(ValueError):
+        CachedNode(WrapperNode(square), directory=str(tmp_path), namespace="../up")